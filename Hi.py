@@ -1,18 +1,74 @@
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.io as pio
-import pyodbc
+import time
+
+# Start-up timings are measured from here, so they include the imports below
+PROCESS_STARTED = time.perf_counter()
+
 from datetime import datetime, timedelta
-from flask import Flask, render_template_string, abort
+from flask import Flask, Response, render_template_string, abort, jsonify, request
 import os
+import threading
+import uuid
+
+from lazy_import import lazy_module
+import fake_msdb
+from job_stats import JobStatsEngine
+from history_search import HistorySearchIndex
+from schedules import ScheduleTimeline
+from ttl_cache import TTLCache
+from run_store import RunStore, STATUSES, FLAGS
+from resilience import CircuitBreaker, with_stale_banner
+from events import EventLog, OUTCOME_EVENTS
+from job_index import RunIndex
+from svg_chart import render_svg
+from db_executor import DbExecutor
+
+# Heavy modules are imported on first use instead of at start-up
+go = lazy_module('plotly.graph_objects')
+pio = lazy_module('plotly.io')
+pyodbc = lazy_module('pyodbc')
 
 app = Flask(__name__)
 
 # Configuration settings
 app.config['PORT'] = int(os.getenv('PORT', 80))
+app.config['SCHEDULE_REFRESH_SECONDS'] = int(os.getenv('SCHEDULE_REFRESH_SECONDS', 600))
+app.config['UPCOMING_HOURS'] = int(os.getenv('UPCOMING_HOURS', 6))
+# Planned runs listed on the dashboard itself: this many hours ahead, at most this many runs
+app.config['DASHBOARD_UPCOMING_HOURS'] = int(os.getenv('DASHBOARD_UPCOMING_HOURS', 2))
+app.config['DASHBOARD_UPCOMING_LIMIT'] = int(os.getenv('DASHBOARD_UPCOMING_LIMIT', 10))
+app.config['JOB_DETAIL_DAYS'] = int(os.getenv('JOB_DETAIL_DAYS', 7))
+app.config['JOB_DETAIL_CACHE_SIZE'] = int(os.getenv('JOB_DETAIL_CACHE_SIZE', 64))
+app.config['JOB_DETAIL_CACHE_TTL'] = int(os.getenv('JOB_DETAIL_CACHE_TTL', 60))
+app.config['REFRESH_SECONDS'] = int(os.getenv('REFRESH_SECONDS', 30))
+app.config['WARM_UP'] = os.getenv('WARM_UP', '1') == '1'
+app.config['DB_LOGIN_TIMEOUT'] = int(os.getenv('DB_LOGIN_TIMEOUT', 5))
+app.config['DB_QUERY_TIMEOUT'] = int(os.getenv('DB_QUERY_TIMEOUT', 20))
+app.config['DB_FAILURE_THRESHOLD'] = int(os.getenv('DB_FAILURE_THRESHOLD', 3))
+app.config['DB_RETRY_SECONDS'] = int(os.getenv('DB_RETRY_SECONDS', 30))
+# Serve generated data instead of msdb, for load tests (see loadtest.py)
+app.config['FAKE_DB'] = os.getenv('FAKE_DB', '0') == '1'
+app.config['BACKGROUND_REFRESH'] = os.getenv('BACKGROUND_REFRESH', '1') == '1'
+app.config['EVENT_LOG_SIZE'] = int(os.getenv('EVENT_LOG_SIZE', 10000))
+app.config['DB_WORKERS'] = int(os.getenv('DB_WORKERS', 4))
+
+# Cold start timings, reported by /ready
+startup = {
+    'ready': False,
+    'imports_seconds': round(time.perf_counter() - PROCESS_STARTED, 3),
+    'warm_up_seconds': None,
+    'first_byte_seconds': None
+}
+
+# Stops hitting msdb for DB_RETRY_SECONDS after DB_FAILURE_THRESHOLD failures in a row
+db_breaker = CircuitBreaker(app.config['DB_FAILURE_THRESHOLD'], app.config['DB_RETRY_SECONDS'])
+
+# Every msdb query runs on this pool, so at most DB_WORKERS connections are open at once
+db_pool = DbExecutor(app.config['DB_WORKERS'])
 
 def get_db_connection():
-    """Establish a database connection."""
+    """Establish a database connection with login and query timeouts."""
+    if app.config['FAKE_DB']:
+        return fake_msdb.connect()
     conn_str = (
         'DRIVER={ODBC Driver 17 for SQL Server};'
         'SERVER=192.168.0.41;'
@@ -20,11 +76,12 @@ def get_db_connection():
         'Trusted_Connection=yes;'
     )
     try:
-        return pyodbc.connect(conn_str)
+        conn = pyodbc.connect(conn_str, timeout=app.config['DB_LOGIN_TIMEOUT'])
     except pyodbc.Error as e:
         app.logger.error(f"Database connection error: {e}")
-        abort(500, description="Database connection error")
-conn = get_db_connection() 
+        raise
+    conn.timeout = app.config['DB_QUERY_TIMEOUT']
+    return conn
 
 def fetch_job_data():
     """Fetch job data from the database."""
@@ -62,14 +119,8 @@ def fetch_job_data():
             ELSE 'Unknown'
         END AS run_status_description,
         h.message,
-        CONVERT(VARCHAR, CAST(CAST(js.next_run_date AS VARCHAR(8)) AS DATE), 103) AS next_run_date_formatted,
-        STUFF(
-            STUFF(
-                RIGHT('000000' + CAST(js.next_run_time AS VARCHAR(6)), 6),
-                3, 0, ':' 
-            ),
-            6, 0, ':' 
-        ) AS next_run_time_formatted
+        h.instance_id,
+        h.step_id
     FROM
         msdb.dbo.sysjobs j
         LEFT JOIN msdb.dbo.sysjobschedules js ON j.job_id = js.job_id
@@ -83,14 +134,193 @@ def fetch_job_data():
         s.schedule_id DESC, h.run_date DESC, h.run_time DESC;
     '''
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query)
-    columns = [column[0] for column in cursor.description]
-    rows = cursor.fetchall()
-    print(rows[0])
-    conn.close()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        columns = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
     return columns, rows
 
+def fetch_schedule_catalog():
+    """Fetch the schedule definitions of every job from the database."""
+    query = '''
+    SELECT
+        j.job_id,
+        j.name AS job_name,
+        j.enabled AS job_enabled,
+        s.schedule_id,
+        s.name AS schedule_name,
+        s.enabled,
+        s.freq_type,
+        s.freq_interval,
+        s.freq_subday_type,
+        s.freq_subday_interval,
+        s.freq_relative_interval,
+        s.freq_recurrence_factor,
+        s.active_start_date,
+        s.active_end_date,
+        s.active_start_time,
+        s.active_end_time
+    FROM
+        msdb.dbo.sysjobs j
+        JOIN msdb.dbo.sysjobschedules js ON j.job_id = js.job_id
+        JOIN msdb.dbo.sysschedules s ON js.schedule_id = s.schedule_id;
+    '''
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        columns = [column[0] for column in cursor.description]
+        catalog = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+    return catalog
+
+def fetch_job_detail(job_id):
+    """Fetch one job's schedules and its job- and step-level history."""
+    job_query = '''
+    SELECT
+        j.job_id,
+        j.name AS job_name,
+        j.enabled AS job_enabled,
+        j.description,
+        s.name AS schedule_name,
+        CONVERT(VARCHAR, CAST(CAST(NULLIF(js.next_run_date, 0) AS VARCHAR(8)) AS DATE), 103) AS next_run_date_formatted,
+        STUFF(
+            STUFF(
+                RIGHT('000000' + CAST(js.next_run_time AS VARCHAR(6)), 6),
+                3, 0, ':' 
+            ),
+            6, 0, ':' 
+        ) AS next_run_time_formatted
+    FROM
+        msdb.dbo.sysjobs j
+        LEFT JOIN msdb.dbo.sysjobschedules js ON j.job_id = js.job_id
+        LEFT JOIN msdb.dbo.sysschedules s ON js.schedule_id = s.schedule_id
+    WHERE
+        j.job_id = ?;
+    '''
+    history_query = '''
+    SELECT
+        h.instance_id,
+        h.step_id,
+        h.step_name,
+        CONVERT(VARCHAR, CAST(CAST(h.run_date AS VARCHAR(8)) AS DATE), 103) AS run_date_formatted,
+        STUFF(
+            STUFF(
+                RIGHT('000000' + CAST(h.run_time AS VARCHAR(6)), 6),
+                3, 0, ':' 
+            ),
+            6, 0, ':' 
+        ) AS run_time_formatted,
+        STUFF(
+            STUFF(
+                RIGHT('000000' + CAST(h.run_duration AS VARCHAR(6)), 6),
+                3, 0, ':' 
+            ),
+            6, 0, ':' 
+        ) AS run_duration_formatted,
+        CASE h.run_status
+            WHEN 0 THEN 'Failure'
+            WHEN 1 THEN 'Success'
+            WHEN 2 THEN 'Failure'
+            WHEN 3 THEN 'Retry'
+            WHEN 4 THEN 'Canceled'
+            ELSE 'Unknown'
+        END AS run_status_description,
+        h.message
+    FROM
+        msdb.dbo.sysjobhistory h
+    WHERE
+        h.job_id = ?
+        AND h.run_date >= CAST(FORMAT(DATEADD(DAY, ?, GETDATE()), 'yyyyMMdd') AS INT)
+    ORDER BY
+        h.run_date DESC, h.run_time DESC, h.step_id;
+    '''
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(job_query, job_id)
+        columns = [column[0] for column in cursor.description]
+        schedules = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        if not schedules:
+            return None
+        cursor.execute(history_query, job_id, -app.config['JOB_DETAIL_DAYS'])
+        columns = [column[0] for column in cursor.description]
+        history = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        conn.close()
+
+    first = schedules[0]
+    return {
+        'job_id': str(first['job_id']),
+        'job_name': first['job_name'],
+        'enabled': bool(first['job_enabled']),
+        'description': first['description'],
+        'schedules': [
+            {
+                'schedule_name': row['schedule_name'],
+                'next_run': f"{row['next_run_date_formatted']} {row['next_run_time_formatted']}" if row['next_run_date_formatted'] else None
+            }
+            for row in schedules if row['schedule_name']
+        ],
+        'runs': [row for row in history if row['step_id'] == 0],
+        'steps': [row for row in history if row['step_id'] != 0],
+        'stats': job_stats.job_to_dict(str(first['job_id']))
+    }
+
+# One job's drill-down data, loaded on demand and kept briefly
+job_detail_cache = TTLCache(app.config['JOB_DETAIL_CACHE_SIZE'], app.config['JOB_DETAIL_CACHE_TTL'])
+
+# Schedule catalog and the planned-run timeline expanded from it
+schedule_cache = {'catalog': None, 'fetched_at': 0, 'timeline': None}
+schedule_lock = threading.Lock()
+
+def get_schedule_timeline():
+    """Return the planned-run timeline, re-reading sysschedules only every SCHEDULE_REFRESH_SECONDS."""
+    now = datetime.now()
+    lookback = now - timedelta(days=2)
+    horizon = now + timedelta(hours=app.config['UPCOMING_HOURS'])
+    with schedule_lock:
+        if time.time() - schedule_cache['fetched_at'] > app.config['SCHEDULE_REFRESH_SECONDS']:
+            try:
+                schedule_cache['catalog'] = db_pool.call(db_breaker.call, fetch_schedule_catalog)
+                schedule_cache['timeline'] = None
+            except Exception as e:
+                if schedule_cache['catalog'] is None:
+                    raise
+                app.logger.error(f"Error refreshing schedules, keeping the previous ones: {e}")
+            schedule_cache['fetched_at'] = time.time()
+        timeline = schedule_cache['timeline']
+        if timeline is None or not timeline.covers(lookback, horizon):
+            timeline = ScheduleTimeline(
+                schedule_cache['catalog'],
+                now - timedelta(days=3),
+                horizon + timedelta(days=1)
+            )
+            schedule_cache['timeline'] = timeline
+        return timeline
+
+def run_date_to_int(date_str):
+    """Convert a dd/mm/yyyy run date to the yyyymmdd integer msdb uses."""
+    day, month, year = map(int, date_str.split('/'))
+    return year * 10000 + month * 100 + day
+
+def run_started_at(run_date, start_seconds):
+    """Actual start of a run as a datetime."""
+    return datetime(run_date // 10000, run_date // 100 % 100, run_date % 100) + timedelta(seconds=start_seconds)
+
+def lateness_label(timeline, job_id, run_date, start_seconds):
+    """Hover line with how late a run started against its schedule."""
+    if timeline is None:
+        return ''
+    late = timeline.lateness(job_id, run_started_at(run_date, start_seconds))
+    if late is None:
+        return ''
+    return f'<br>Late: {late / 60:.1f} min'
+
 # def time_to_minutes(time_str):
 #     """Convert time string to minutes since midnight."""
 #     curr_time = datetime.now()
@@ -104,9 +334,13 @@ def fetch_job_data():
 
 def time_to_minutes(time_str):
     """Convert time string to minutes since midnight."""
+    return seconds_to_minutes(time_to_seconds(time_str))
+
+def seconds_to_minutes(start_seconds):
+    """Convert a start in seconds since midnight to chart minutes, yesterday's runs negative."""
     curr_time = datetime.now()
-    hours, minutes, seconds = map(int, time_str.split(':'))
-    time = hours * 60 + minutes + seconds / 60
+    hours, minutes = start_seconds // 3600, start_seconds // 60 % 60
+    time = start_seconds / 60
     if curr_time.hour  == hours :
         if curr_time.minute >= minutes:
             return time
@@ -125,6 +359,84 @@ def time_to_seconds(duration_str):
     hours, minutes, seconds = map(int, duration_str.split(':'))
     return hours * 3600 + minutes * 60 + seconds
 
+# Duration statistics per job, fed incrementally from every fetched batch
+job_stats = JobStatsEngine()
+# Full-text index over the messages of the history rows seen so far
+search_index = HistorySearchIndex()
+
+# sysjobhistory.step_id of the row holding a whole job run's outcome
+JOB_OUTCOME_STEP = 0
+
+def is_job_outcome(row):
+    """Whether a history row is a job's outcome rather than one of its steps."""
+    return row[14] == JOB_OUTCOME_STEP
+
+def rows_to_store(rows):
+    """Pack fetched history rows into a RunStore, with the anomaly flag of each job run."""
+    store = RunStore()
+    for row in rows:
+        flag = job_stats.flag_for(row[13]) if is_job_outcome(row) else None
+        store.append(str(row[0]), row[1], run_date_to_int(row[7]), time_to_seconds(row[8]), time_to_seconds(row[10]), row[11], flag)
+    return store
+
+def ingest_runs(rows):
+    """Feed newly seen history rows into the statistics and search index, oldest first.
+
+    Every row is searchable under its own instance_id, since the error text
+    of a failed run is on its step rows. Only job outcome rows count as runs
+    for the statistics. Returns the outcome rows not seen before.
+    """
+    new_rows = []
+    for row in reversed(rows):
+        key = row[13]
+        search_index.add(key, row[0], row[1], row[7], row[8], row[11], row[12], row[14])
+        if not is_job_outcome(row) or job_stats.seen(key):
+            continue
+        job_stats.ingest(key, str(row[0]), row[1], time_to_seconds(row[10]), {'run_date': row[7], 'run_time': row[8]})
+        new_rows.append(row)
+    return new_rows
+
+# Run events for downstream consumers, diffed from consecutive snapshots
+event_log = EventLog(app.config['EVENT_LOG_SIZE'])
+
+def run_events(rows):
+    """A 'started' and an outcome event for each new job run, in time order.
+
+    Only job outcome rows make events, one pair per instance_id, so a run's
+    steps never show up as runs of their own.
+    """
+    events = []
+    emitted = set()
+    for row in rows:
+        if not is_job_outcome(row) or row[13] in emitted:
+            continue
+        emitted.add(row[13])
+        started = datetime.strptime(row[7] + ' ' + row[8], '%d/%m/%Y %H:%M:%S')
+        duration = time_to_seconds(row[10])
+        run = {'instance_id': row[13], 'job_id': str(row[0]), 'job_name': row[1], 'run_date': row[7], 'run_time': row[8]}
+        events.append(dict(run, type='started', at=started.isoformat()))
+        events.append(dict(
+            run,
+            type=OUTCOME_EVENTS.get(row[11], 'unknown'),
+            at=(started + timedelta(seconds=duration)).isoformat(),
+            status=row[11],
+            duration_seconds=duration,
+            message=row[12]
+        ))
+    events.sort(key=lambda event: event['at'])
+    return events
+
+def short_job_name(name):
+    return name if len(name) <= 20 else name[:17] + '...'
+
+def anomaly_label(flag):
+    """Short marker appended to a bar's text for abnormal runs."""
+    if flag == 'long':
+        return ' \u25b2'
+    if flag == 'short':
+        return ' \u25bc'
+    return ''
+
 def generate_tick_labels(start_time, end_time, step_minutes):
     """Generate tick labels for the y-axis."""
     labels = []
@@ -153,168 +465,518 @@ def determine_step_interval(current_time, last_6_hours_start):
     else:
         return 15  # Show ticks every 15 minutes
 
-@app.route('/')
-def index():
+status_colors = {
+    'Success': 'green',
+    'Failure': 'red',
+    'Retry': 'orange',
+    'Canceled': 'grey',
+    'Unknown': 'white'
+}
+
+def render_dashboard(store):
+    """Build the job status chart page for the runs in a RunStore."""
     try:
-        columns, rows = fetch_job_data()
-        job_data = {
-            'Job': [row[1] for row in rows],
-            'Start': [time_to_minutes(row[8]) for row in rows],
-            'Duration': [time_to_seconds(row[10]) / 60 for row in rows],  # Convert duration to minutes
-            'Status': [row[11] for row in rows],
-            'Run':[row[7] + ' ' + row[8] for row in rows],
-            'Next Run': [str(row[13]) + ' ' + str(row[14])  for row in rows]
-        }
-
-        df = pd.DataFrame(job_data)
-        df['End'] = df.apply(lambda row: row['Start'] + max(row['Duration'], 5), axis=1)
-
-        status_colors = {
-            'Success': 'green',
-            'Failure': 'red',
-            'Retry': 'orange',
-            'Canceled': 'grey',
-            'Unknown': 'white'
-        }
-        df['Color'] = df['Status'].map(status_colors)
-
-        fig = go.Figure()
-
-        for status in df['Status'].unique():
-            df_status = df[df['Status'] == status]
-            fig.add_trace(go.Bar(
-                x=df_status['Job'].apply(lambda x: x if len(x) <= 20 else x[:17] + '...'),
-                y=df_status['End'] - df_status['Start'],
-                base=df_status['Start'],
-                marker_color=df_status['Color'],
-                text=df_status['Duration'].apply(lambda d: f'{d:.1f} min'),
-                textposition='inside',
-                hovertext='Job Name: ' + df_status['Job'] + '<br>Start: ' + df_status['Start'].apply(time_display_hover) + '<br>Duration: ' + df_status['Duration'].apply(lambda d: f'{d:.1f} min' ) + '<br>Run: ' + df_status['Run'] +'<br>Next Run: ' + df_status['Next Run'],
-                hoverinfo='text',
-                name=status
-            ))
-
-        now = datetime.now()
-        current_time_in_minutes = now.hour * 60 + now.minute
-        last_6_hours_start = current_time_in_minutes - 1440
-        last_3_hours_start = current_time_in_minutes - 180
-
-        step_interval = determine_step_interval(current_time_in_minutes, last_6_hours_start)
-        tick_vals = list(range(last_6_hours_start, current_time_in_minutes + 1, step_interval))
-        tick_text = generate_tick_labels(last_6_hours_start, current_time_in_minutes, step_interval)
-
-        fig.update_layout(
-            width=1200,
-            height=600,
-            template='plotly_dark',
-            xaxis=dict(
-                title='Job Names',
-                fixedrange=True,  # Disable dragging and zooming on x-axis
-                tickangle=0,
-                tickmode='array',
-                tickvals=df['Job'].apply(lambda x: x if len(x) <= 20 else x[:17] + '...'),
-                ticktext=df['Job'].apply(lambda x: x if len(x) <= 20 else x[:7] + '...')
-            ),
-            yaxis=dict(
-                title='Time',
-                range=[last_3_hours_start, current_time_in_minutes],  # Show only the last 6 hours
-                tickmode='array',
-                tickvals=tick_vals,
-                ticktext=tick_text,
-                fixedrange=False  # Allow zooming and panning on y-axis
-            ),
-            barmode='stack',
-            bargap=0.2,  # Gap between bars
-            dragmode="pan",
-            margin=dict(l=50, r=50, t=30, b=80),  # Adjusted margins
-            autosize=False
-        )
-
-        graph_html = pio.to_html(fig, full_html=False)
-
-        html_template = '''
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
-            <title>Job Status Visualization</title>
-            <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css" rel="stylesheet">
-            <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js"></script>
-            <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-            <style>
-                html, body {
-                    margin: 0;
-                    padding: 0;
-                    height: 100%;
-                    width: 100%;
-                    overflow: hidden;
-                    touch-action: none;
-                }
-                .full-screen {
-                    position: fixed;
-                    top: 0;
-                    left: 0;
-                    width: 100%;
-                    height: 100%;
-                    background-color: #f0f0f0;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    box-sizing: border-box;
-                }
-                .content {
-                    text-align: center;
-                    font-family: Arial, sans-serif;
-                    color: #333;
-                }
-                .scroll-container {
-                    overflow-x: auto;
-                    width: 100%;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="full-screen bg-dark">
-                <div class="content w-100">
-                    <div class="scroll-container">
-                        <div id="plotly-graph">
-                            <h1 class="text-white bg-dark">Job Status Visualization</h1>
-                            {{ graph_html | safe }}
-                        </div>
+        timeline = get_schedule_timeline()
+    except Exception as e:
+        app.logger.error(f"Error loading schedules: {e}")
+        timeline = None
+
+    # Group run positions by status code, in order of first appearance
+    by_status = {}
+    for i, code in enumerate(store.statuses):
+        by_status.setdefault(code, []).append(i)
+
+    fig = go.Figure()
+
+    for code, positions in by_status.items():
+        status = STATUSES[code]
+        x, y, base, text, hovertext, customdata = [], [], [], [], [], []
+        for i in positions:
+            job = store.jobs[i]
+            job_id, job_name = store.job_ids[job], store.job_names[job]
+            run_date, start_seconds = store.run_dates[i], store.starts[i]
+            start = seconds_to_minutes(start_seconds)
+            duration = store.durations[i] / 60  # Convert duration to minutes
+            flag = FLAGS[store.flags[i]]
+            x.append(short_job_name(job_name))
+            y.append(max(duration, 5))
+            base.append(start)
+            text.append(f'{duration:.1f} min' + anomaly_label(flag))
+            hovertext.append(
+                'Job Name: ' + job_name + '<br>Start: ' + time_display_hover(start) + f'<br>Duration: {duration:.1f} min'
+                + (f'<br>Abnormally {flag} run' if flag else '') + lateness_label(timeline, job_id, run_date, start_seconds)
+            )
+            customdata.append(job_id)
+        fig.add_trace(go.Bar(
+            x=x,
+            y=y,
+            base=base,
+            marker_color=status_colors[status],
+            text=text,
+            textposition='inside',
+            hovertext=hovertext,
+            hoverinfo='text',
+            customdata=customdata,
+            name=status
+        ))
+
+    now = datetime.now()
+    upcoming_runs = []
+    if timeline is not None:
+        upcoming_runs = [
+            dict(run, at=run['at'][11:16])
+            for run in timeline.upcoming(now, now + timedelta(hours=app.config['DASHBOARD_UPCOMING_HOURS']))
+        ][:app.config['DASHBOARD_UPCOMING_LIMIT']]
+
+    current_time_in_minutes = now.hour * 60 + now.minute
+    last_6_hours_start = current_time_in_minutes - 1440
+    last_3_hours_start = current_time_in_minutes - 180
+
+    step_interval = determine_step_interval(current_time_in_minutes, last_6_hours_start)
+    tick_vals = list(range(last_6_hours_start, current_time_in_minutes + 1, step_interval))
+    tick_text = generate_tick_labels(last_6_hours_start, current_time_in_minutes, step_interval)
+
+    fig.update_layout(
+        width=1200,
+        height=600,
+        template='plotly_dark',
+        xaxis=dict(
+            title='Job Names',
+            fixedrange=True,  # Disable dragging and zooming on x-axis
+            tickangle=0,
+            tickmode='array',
+            tickvals=[short_job_name(store.job_names[job]) for job in store.jobs],
+            ticktext=[x if len(x) <= 20 else x[:7] + '...' for x in (store.job_names[job] for job in store.jobs)]
+        ),
+        yaxis=dict(
+            title='Time',
+            range=[last_3_hours_start, current_time_in_minutes],  # Show only the last 6 hours
+            tickmode='array',
+            tickvals=tick_vals,
+            ticktext=tick_text,
+            fixedrange=False  # Allow zooming and panning on y-axis
+        ),
+        barmode='stack',
+        bargap=0.2,  # Gap between bars
+        dragmode="pan",
+        margin=dict(l=50, r=50, t=30, b=80),  # Adjusted margins
+        autosize=False
+    )
+
+    graph_html = pio.to_html(fig, full_html=False)
+
+    html_template = '''
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
+        <title>Job Status Visualization</title>
+        <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css" rel="stylesheet">
+        <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js"></script>
+        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+        <style>
+            html, body {
+                margin: 0;
+                padding: 0;
+                height: 100%;
+                width: 100%;
+                overflow: hidden;
+                touch-action: none;
+            }
+            .full-screen {
+                position: fixed;
+                top: 0;
+                left: 0;
+                width: 100%;
+                height: 100%;
+                background-color: #f0f0f0;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                box-sizing: border-box;
+            }
+            .content {
+                text-align: center;
+                font-family: Arial, sans-serif;
+                color: #333;
+            }
+            .scroll-container {
+                overflow-x: auto;
+                width: 100%;
+            }
+            .upcoming {
+                position: fixed;
+                top: 100px;
+                right: 20px;
+                z-index: 9999;
+                max-width: 320px;
+                padding: 8px 12px;
+                background-color: rgba(17, 17, 17, 0.85);
+                border: 1px solid #283442;
+                border-radius: 5px;
+                font-family: Arial, sans-serif;
+                font-size: 12px;
+                color: #f2f5fa;
+                text-align: left;
+            }
+            .upcoming a {
+                color: #f2f5fa;
+                text-decoration: none;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="full-screen bg-dark">
+            <div class="content w-100">
+                <div class="scroll-container">
+                    <div id="plotly-graph">
+                        <h1 class="text-white bg-dark">Job Status Visualization</h1>
+                        {{ graph_html | safe }}
                     </div>
                 </div>
             </div>
-            <a href="http://127.0.0.1:3001/" style="position: fixed; Top: 40px; right: 20px; z-index: 9999;">
-                <button style="padding: 10px 20px; background-color: #007bff; color: white; border: none; border-radius: 5px; cursor: pointer; font-size: 16px;">
-                    One Time Jobs
-                </button>
-            </a>
-            <script>
-                document.addEventListener('wheel', function(event) {
-                    if (event.ctrlKey) {
-                        event.preventDefault();
-                    }
-                }, { passive: false });
-                document.addEventListener('gesturestart', function(event) {
+        </div>
+        <a href="http://127.0.0.1:3001/" style="position: fixed; Top: 40px; right: 20px; z-index: 9999;">
+            <button style="padding: 10px 20px; background-color: #007bff; color: white; border: none; border-radius: 5px; cursor: pointer; font-size: 16px;">
+                One Time Jobs
+            </button>
+        </a>
+        <div class="upcoming">
+            <strong>Next {{ upcoming_hours }} hours</strong>
+            {% for run in upcoming_runs %}
+            <div><a href="/job/{{ run.job_id }}" target="_blank">{{ run.at }} {{ run.job_name }}</a></div>
+            {% else %}
+            <div>No planned runs</div>
+            {% endfor %}
+        </div>
+        <script>
+            document.addEventListener('wheel', function(event) {
+                if (event.ctrlKey) {
                     event.preventDefault();
-                });
-                
-                // Reload the page every 30 seconds
-                setTimeout(function() {
-                    window.location.reload();
-                }, 30000);  // 30 seconds
-            </script>
-        </body>
-        </html>
-        '''
-
-        return render_template_string(html_template, graph_html=graph_html)
+                }
+            }, { passive: false });
+            document.addEventListener('gesturestart', function(event) {
+                event.preventDefault();
+            });
+            
+            // Open a job's details when its bar is clicked
+            document.addEventListener('DOMContentLoaded', function() {
+                var graphDiv = document.querySelector('#plotly-graph .plotly-graph-div');
+                if (graphDiv) {
+                    graphDiv.on('plotly_click', function(data) {
+                        window.open('/job/' + data.points[0].customdata, '_blank');
+                    });
+                }
+            });
+
+            // Reload the page every 30 seconds
+            setTimeout(function() {
+                window.location.reload();
+            }, 30000);  // 30 seconds
+        </script>
+    </body>
+    </html>
+    '''
+
+    return render_template_string(
+        html_template,
+        graph_html=graph_html,
+        upcoming_runs=upcoming_runs,
+        upcoming_hours=app.config['DASHBOARD_UPCOMING_HOURS']
+    )
+
+# Latest query result and the page rendered from it, shared by every viewer
+snapshot = {'version': 0, 'fetched_at': 0, 'runs': None, 'index': None, 'html': None}
+snapshot_lock = threading.Lock()
+
+def load_schedules():
+    """Bring the schedule timeline up to date, logging rather than failing a refresh."""
+    try:
+        get_schedule_timeline()
+    except Exception as e:
+        app.logger.error(f"Error loading schedules: {e}")
+
+def ingest_snapshot(rows):
+    """Ingest the new runs of a fetched batch and pack it into a store and index."""
+    new_rows = ingest_runs(rows)
+    # The first snapshot is the baseline; only later differences are events
+    if snapshot['version'] > 0:
+        event_log.append(run_events(new_rows))
+    runs = rows_to_store(rows)
+    return runs, RunIndex(runs, job_attributes(rows))
+
+def render_in_app_context(store):
+    with app.app_context():
+        return render_dashboard(store)
+
+def refresh_snapshot():
+    """Query job history, ingest the new runs and render the dashboard once.
+
+    The history query runs on the msdb pool while the schedule catalog is
+    brought up to date, which queries msdb only every SCHEDULE_REFRESH_SECONDS.
+    Ingesting and rendering are CPU-bound and run on the calling thread.
+    """
+    history = db_pool.submit(db_breaker.call, fetch_job_data)
+    load_schedules()
+    columns, rows = history.result()
+
+    runs, index = ingest_snapshot(rows)
+    html = render_in_app_context(runs)
+    version = snapshot['version'] + 1
+    snapshot.update(version=version, fetched_at=time.time(), runs=runs, index=index, html=html)
+    # Ready from the first good snapshot on, whether or not warm-up got there
+    startup['ready'] = True
+
+def job_attributes(rows):
+    """Enabled flag and schedule names of each job in a batch of history rows."""
+    attrs = {}
+    for row in rows:
+        job = attrs.setdefault(str(row[0]), {'enabled': bool(row[2]), 'schedules': set()})
+        if row[4]:
+            job['schedules'].add(row[4].lower())
+    return attrs
+
+def snapshot_age():
+    return time.time() - snapshot['fetched_at']
+
+def get_snapshot():
+    """Return the current snapshot, refreshing it when older than REFRESH_SECONDS.
+
+    Only one request refreshes at a time. While it does, and while the
+    database is failing, everyone else gets the last good snapshot.
+    """
+    if snapshot['html'] is not None and snapshot_age() <= app.config['REFRESH_SECONDS']:
+        return dict(snapshot)
+    if not snapshot_lock.acquire(blocking=snapshot['html'] is None):
+        return dict(snapshot)
+    try:
+        if snapshot['html'] is None or snapshot_age() > app.config['REFRESH_SECONDS']:
+            try:
+                refresh_snapshot()
+            except Exception as e:
+                if snapshot['html'] is None:
+                    raise
+                app.logger.error(f"Error refreshing data, serving snapshot {snapshot['version']}: {e}")
+        return dict(snapshot)
+    finally:
+        snapshot_lock.release()
+
+# Pages rendered for filtered views, per snapshot version and filter
+filtered_pages = TTLCache(32, app.config['REFRESH_SECONDS'])
+
+def view_filters():
+    """Filters from the query string, e.g. /?prefix=ETL&status=Failure,Retry&enabled=1&schedule=Nightly."""
+    statuses = request.args.get('status')
+    enabled = request.args.get('enabled')
+    return (
+        request.args.get('prefix') or None,
+        request.args.get('contains') or None,
+        tuple(sorted(s.strip().capitalize() for s in statuses.split(',') if s.strip())) if statuses else None,
+        enabled not in ('0', 'false', 'no') if enabled else None,
+        request.args.get('schedule') or None
+    )
+
+def filtered_runs(current, filters):
+    """Cut the snapshot down to the runs matching filters."""
+    if not any(f is not None for f in filters):
+        return current['runs']
+    prefix, contains, statuses, enabled, schedule = filters
+    return current['runs'].subset(current['index'].select(prefix, contains, statuses, enabled, schedule))
+
+def render_chart_svg(store):
+    """The dashboard chart as static SVG, drawn straight from the run arrays."""
+    now = datetime.now()
+    current_time_in_minutes = now.hour * 60 + now.minute
+    return render_svg(store, seconds_to_minutes, status_colors, current_time_in_minutes - 180, current_time_in_minutes)
+
+def render_kiosk(store):
+    """Minimal HTML around the SVG chart for low-power displays; no scripts."""
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="UTF-8">'
+        f'<meta http-equiv="refresh" content="{app.config["REFRESH_SECONDS"]}">'
+        '<title>Job Status Visualization</title>'
+        '<style>body{margin:0;background:#111;color:#f2f5fa;font-family:Arial,sans-serif;text-align:center}</style>'
+        '</head><body><h1>Job Status Visualization</h1>' + render_chart_svg(store) + '</body></html>'
+    )
+
+def cached_view(current, filters, mode):
+    """Render a view of the snapshot once per snapshot version, filter and mode."""
+    if mode == 'html' and not any(f is not None for f in filters):
+        return current['html']
+    renderers = {'html': render_dashboard, 'svg': render_kiosk, 'chart.svg': render_chart_svg}
+    return filtered_pages.get_or_load(
+        (current['version'], filters, mode), lambda: renderers[mode](filtered_runs(current, filters))
+    )
+
+@app.route('/')
+def index():
+    """The dashboard; ?mode=svg serves the static SVG page for kiosk displays."""
+    filters = view_filters()
+    mode = 'svg' if request.args.get('mode') == 'svg' else 'html'
+    try:
+        current = get_snapshot()
+        html = cached_view(current, filters, mode)
     except Exception as e:
         app.logger.error(f"Error rendering page: {e}")
         abort(500, description="Internal Server Error")
+    age = time.time() - current['fetched_at']
+    if age > 2 * app.config['REFRESH_SECONDS']:
+        return with_stale_banner(html, age)
+    return html
+
+@app.route('/chart.svg')
+def chart_svg():
+    """The status chart as a bare SVG image; accepts the same filters as /."""
+    try:
+        svg = cached_view(get_snapshot(), view_filters(), 'chart.svg')
+    except Exception as e:
+        app.logger.error(f"Error rendering chart: {e}")
+        abort(500, description="Internal Server Error")
+    return Response(svg, mimetype='image/svg+xml')
+
+@app.route('/stats')
+def stats():
+    """Per-job duration statistics and the runs flagged as abnormal."""
+    return jsonify(job_stats.to_dict())
+
+def parse_date_arg(name):
+    """Read an optional yyyy-mm-dd date from the query string."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        abort(400, description=f"Invalid {name} date, expected yyyy-mm-dd")
+
+@app.route('/search')
+def search():
+    """Search retained history messages, e.g. /search?q=deadlock&job=ETL&from=2024-05-01."""
+    query = request.args.get('q', '')
+    if not query.strip():
+        abort(400, description="Missing search text in 'q'")
+    limit = request.args.get('limit', 50, type=int)
+    started = time.perf_counter()
+    results = search_index.search(
+        query,
+        job=request.args.get('job'),
+        status=request.args.get('status'),
+        date_from=parse_date_arg('from'),
+        date_to=parse_date_arg('to'),
+        limit=max(1, min(limit, 500))
+    )
+    return jsonify({
+        'query': query,
+        'indexed_runs': len(search_index),
+        'took_ms': round((time.perf_counter() - started) * 1000, 2),
+        'results': results
+    })
+
+@app.route('/job/<job_id>')
+def job_detail(job_id):
+    """Extended history, messages and step rows of one job, loaded only when asked for."""
+    try:
+        job_id = str(uuid.UUID(job_id)).upper()
+    except ValueError:
+        abort(404, description="Unknown job")
+    try:
+        detail = job_detail_cache.get_or_load(job_id, lambda: db_pool.call(db_breaker.call, fetch_job_detail, job_id))
+    except Exception as e:
+        app.logger.error(f"Error loading job {job_id}: {e}")
+        abort(503, description="Database unavailable")
+    if detail is None:
+        abort(404, description="Unknown job")
+    return jsonify(detail)
+
+@app.route('/upcoming')
+def upcoming():
+    """Planned runs over the next few hours, e.g. /upcoming?hours=3."""
+    hours = request.args.get('hours', app.config['UPCOMING_HOURS'], type=int)
+    hours = max(1, min(hours, app.config['UPCOMING_HOURS']))
+    try:
+        timeline = get_schedule_timeline()
+    except Exception as e:
+        app.logger.error(f"Error loading schedules: {e}")
+        abort(503, description="Schedules unavailable")
+    now = datetime.now()
+    return jsonify({
+        'from': now.isoformat(),
+        'to': (now + timedelta(hours=hours)).isoformat(),
+        'runs': timeline.upcoming(now, now + timedelta(hours=hours))
+    })
+
+@app.route('/events')
+def events_feed():
+    """Long-poll for run events after a cursor, e.g. /events?cursor=120&timeout=25.
+
+    Without a cursor the feed starts at the newest event; cursor=0 returns
+    everything still retained.
+    """
+    cursor = request.args.get('cursor', type=int)
+    if cursor is None:
+        cursor = event_log.last_seq
+    timeout = max(0.0, min(request.args.get('timeout', 25, type=float), 60.0))
+    limit = max(1, min(request.args.get('limit', 500, type=int), 5000))
+    try:
+        get_snapshot()
+    except Exception as e:
+        app.logger.error(f"Error refreshing data: {e}")
+    return jsonify(event_log.wait(cursor, timeout, limit))
+
+def start_refresher():
+    """Keep the snapshot and event log fresh even when no page is being viewed."""
+    def refresh_forever():
+        while True:
+            time.sleep(app.config['REFRESH_SECONDS'])
+            try:
+                with app.app_context():
+                    get_snapshot()
+            except Exception as e:
+                app.logger.error(f"Background refresh failed: {e}")
+    threading.Thread(target=refresh_forever, name='snapshot-refresher', daemon=True).start()
+
+def warm_up():
+    """Connect, load schedules and render the first snapshot before serving."""
+    started = time.perf_counter()
+    with app.app_context():
+        db_pool.call(lambda: get_db_connection().close())
+        try:
+            get_schedule_timeline()
+        except Exception as e:
+            app.logger.error(f"Error loading schedules: {e}")
+        get_snapshot()
+    startup['warm_up_seconds'] = round(time.perf_counter() - started, 3)
+    app.logger.info(f"Warm-up finished in {startup['warm_up_seconds']}s")
+
+@app.after_request
+def record_first_byte(response):
+    if startup['first_byte_seconds'] is None:
+        startup['first_byte_seconds'] = round(time.perf_counter() - PROCESS_STARTED, 3)
+        app.logger.info(f"First response {startup['first_byte_seconds']}s after process start")
+    return response
+
+@app.route('/ready')
+def ready():
+    """Readiness probe with the cold start timings; ready once a snapshot was rendered.
+
+    On the fake msdb it also reports how many queries were run, for loadtest.py.
+    """
+    status = dict(startup, database=db_breaker.state)
+    if app.config['FAKE_DB']:
+        status['backend_queries'] = fake_msdb.query_count
+    return jsonify(status), 200 if startup['ready'] else 503
 
 if __name__ == '__main__':
+    if app.config['WARM_UP']:
+        try:
+            warm_up()
+        except Exception as e:
+            app.logger.error(f"Warm-up failed, serving cold: {e}")
+    else:
+        startup['ready'] = True
+    if app.config['BACKGROUND_REFRESH']:
+        start_refresher()
     app.run(host='0.0.0.0', port=app.config['PORT'])
 
 
@@ -0,0 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DbExecutor:
+    """Bounded pool of threads that every msdb call runs on.
+
+    A call opens and closes its connection inside a worker, so no more than
+    max_workers connections are open at once, however many request threads
+    and refreshes want data. Independent queries can be submitted together
+    to overlap their waits on the server. Calls running on the pool must not
+    wait on the pool themselves.
+    """
+
+    def __init__(self, max_workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='msdb')
+
+    def submit(self, fn, *args):
+        """Start a blocking msdb call on the pool and return its future."""
+        return self.executor.submit(fn, *args)
+
+    def call(self, fn, *args):
+        """Run a blocking msdb call on the pool and wait for its result."""
+        return self.executor.submit(fn, *args).result()
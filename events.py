@@ -0,0 +1,59 @@
+import threading
+from collections import deque
+
+# Event type emitted for each run_status_description
+OUTCOME_EVENTS = {
+    'Success': 'succeeded',
+    'Failure': 'failed',
+    'Retry': 'retried',
+    'Canceled': 'canceled',
+    'Unknown': 'unknown'
+}
+
+# Events kept for consumers that fall behind
+MAX_EVENTS = 10000
+
+
+class EventLog:
+    """Ordered, bounded log of job run events with sequence-number cursors.
+
+    Every event gets the next sequence number. Consumers pass the last number
+    they saw as their cursor and get everything after it, waiting up to a
+    timeout when there is nothing new yet.
+    """
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self.events = deque(maxlen=max_events)
+        self.last_seq = 0
+        self.condition = threading.Condition()
+
+    def append(self, events):
+        if not events:
+            return
+        with self.condition:
+            for event in events:
+                self.last_seq += 1
+                event['seq'] = self.last_seq
+                self.events.append(event)
+            self.condition.notify_all()
+
+    def _since(self, cursor, limit):
+        oldest = self.events[0]['seq'] if self.events else self.last_seq + 1
+        # Events are numbered consecutively, so the first wanted one can be indexed directly
+        start = max(cursor + 1 - oldest, 0)
+        batch = [self.events[i] for i in range(start, min(start + limit, len(self.events)))]
+        return {
+            'events': batch,
+            'cursor': batch[-1]['seq'] if batch else cursor,
+            'last_seq': self.last_seq,
+            'truncated': cursor + 1 < oldest and cursor < self.last_seq
+        }
+
+    def wait(self, cursor, timeout, limit=500):
+        """Events after cursor, blocking up to timeout seconds until there are some."""
+        with self.condition:
+            if cursor > self.last_seq:
+                # Cursor from before a restart; start again from the current end
+                cursor = self.last_seq
+            self.condition.wait_for(lambda: self.last_seq > cursor, timeout)
+            return self._since(cursor, limit)
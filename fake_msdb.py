@@ -0,0 +1,221 @@
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# Size and speed of the fake msdb, adjustable before the first connect()
+settings = {
+    'jobs': int(os.getenv('FAKE_DB_JOBS', 50)),
+    'runs_every_minutes': 30,
+    'history_hours': 36,
+    'latency_ms': int(os.getenv('FAKE_DB_LATENCY_MS', 50)),
+    'seed': 1
+}
+
+# Number of queries executed against the fake server
+query_count = 0
+query_count_lock = threading.Lock()
+
+STATUS_WEIGHTS = (('Success', 90), ('Failure', 5), ('Retry', 3), ('Canceled', 2))
+# As in msdb, the job outcome row only says how the job ended; the error text is on the step rows
+OUTCOME_MESSAGES = {
+    'Success': 'The job succeeded.  The Job was invoked by Schedule {schedule} ({name}).  The last step to run was step {step} ({step_name}).',
+    'Failure': 'The job failed.  The Job was invoked by Schedule {schedule} ({name}).  The last step to run was step {step} ({step_name}).',
+    'Retry': 'The job failed.  The Job was invoked by Schedule {schedule} ({name}).  The last step to run was step {step} ({step_name}).',
+    'Canceled': 'The job was stopped prior to completion by User sa.  The Job was invoked by Schedule {schedule} ({name}).  The last step to run was step {step} ({step_name}).'
+}
+STEP_MESSAGES = {
+    'Success': 'Executed as user: NT SERVICE\\SQLSERVERAGENT. The step succeeded.',
+    'Failure': 'Executed as user: NT SERVICE\\SQLSERVERAGENT. Transaction (Process ID 57) was deadlocked on lock resources with another process and has been chosen as the deadlock victim. Rerun the transaction. [SQLSTATE 40001] (Error 1205).  The step failed.',
+    'Retry': 'Executed as user: NT SERVICE\\SQLSERVERAGENT. Login timeout expired [SQLSTATE HYT00].  The step failed and will be retried.',
+    'Canceled': 'The step was cancelled (stopped) as the result of a stop job request.'
+}
+
+
+# Steps of every fake job; sysjobhistory also has a step 0 row per run for the job outcome
+STEPS = ((1, 'Extract'), (2, 'Load'))
+
+
+class FakeError(Exception):
+    pass
+
+
+def job_id(n):
+    return str(uuid.UUID(int=n + 1)).upper()
+
+
+def job_name(n):
+    return f'Fake Job {n:03d} - {random.Random(n).choice(["ETL Load", "Backup", "Index Rebuild", "Report Export", "Sync"])}'
+
+
+def pick_status(rng):
+    roll = rng.randint(1, 100)
+    for status, weight in STATUS_WEIGHTS:
+        if roll <= weight:
+            return status
+        roll -= weight
+    return 'Unknown'
+
+
+def hhmmss(seconds):
+    return f'{seconds // 3600:02}:{seconds // 60 % 60:02}:{seconds % 60:02}'
+
+
+def message(n, step_id, status):
+    """sysjobhistory.message of one row of a run."""
+    if step_id:
+        return STEP_MESSAGES[status]
+    step, step_name = STEPS[-1]
+    return OUTCOME_MESSAGES[status].format(
+        schedule=n + 1, name=f'Every {settings["runs_every_minutes"]} minutes', step=step, step_name=step_name
+    )
+
+
+def instance_id(n, started, step_id):
+    """Stable sysjobhistory.instance_id; the outcome row is logged after the steps, as in msdb."""
+    run = int(started.timestamp()) // 60 * settings['jobs'] + n
+    return run * (len(STEPS) + 1) + (step_id or len(STEPS) + 1) - 1
+
+
+def step_rows(n, started, duration, status):
+    """(instance_id, step_id, step_name, start seconds, duration, status) of a run's history rows, outcome first."""
+    start_seconds = started.hour * 3600 + started.minute * 60 + started.second
+    rows = [(instance_id(n, started, 0), 0, '(Job outcome)', start_seconds, duration, status)]
+    step_start, remaining = start_seconds, duration
+    for i, (step_id, step_name) in enumerate(STEPS):
+        step_duration = remaining if i == len(STEPS) - 1 else remaining // 2
+        step_status = status if i == len(STEPS) - 1 else 'Success'
+        rows.append((instance_id(n, started, step_id), step_id, step_name, step_start, step_duration, step_status))
+        step_start, remaining = step_start + step_duration, remaining - step_duration
+    return rows
+
+
+def history(job_ids=None, since=None):
+    """Runs of every job on a fixed grid of slots, stable across calls."""
+    now = datetime.now()
+    step = timedelta(minutes=settings['runs_every_minutes'])
+    oldest = since or now - timedelta(hours=settings['history_hours'])
+    rows = []
+    for n in range(settings['jobs']):
+        if job_ids is not None and job_id(n) not in job_ids:
+            continue
+        offset = timedelta(minutes=n % settings['runs_every_minutes'])
+        slot = datetime(oldest.year, oldest.month, oldest.day) + offset
+        while slot < now:
+            rng = random.Random(f"{settings['seed']}:{n}:{slot:%Y%m%d%H%M}")
+            duration = max(1, int(rng.gauss(60 + n * 7, 20)))
+            if rng.random() < 0.02:
+                duration *= 8
+            if slot >= oldest and slot + timedelta(seconds=duration) <= now:
+                rows.append((n, slot, duration, pick_status(rng)))
+            slot += step
+    rows.sort(key=lambda r: r[1], reverse=True)
+    return rows
+
+
+def history_rows():
+    rows = []
+    schedule = f'Every {settings["runs_every_minutes"]} minutes'
+    for n, started, duration, status in history():
+        for instance, step_id, _, start_seconds, step_duration, step_status in step_rows(n, started, duration, status):
+            rows.append((
+                job_id(n), job_name(n), 1, n + 1, schedule, 4, 1,
+                started.strftime('%d/%m/%Y'), hhmmss(start_seconds),
+                step_duration // 3600 * 10000 + step_duration // 60 % 60 * 100 + step_duration % 60, hhmmss(step_duration),
+                step_status, message(n, step_id, step_status), instance, step_id
+            ))
+    return rows
+
+
+def catalog_rows():
+    return [
+        (
+            job_id(n), job_name(n), 1, n + 1, f'Every {settings["runs_every_minutes"]} minutes', 1,
+            4, 1, 4, settings['runs_every_minutes'], 0, 0, 20240101, 99991231, n % settings['runs_every_minutes'] * 100, 235959
+        )
+        for n in range(settings['jobs'])
+    ]
+
+
+def job_rows(wanted):
+    return [
+        (job_id(n), job_name(n), 1, 'Fake job', f'Every {settings["runs_every_minutes"]} minutes', None, None)
+        for n in range(settings['jobs']) if job_id(n) == wanted
+    ]
+
+
+def job_history_rows(wanted, days):
+    rows = []
+    for n, started, duration, status in history({wanted}, datetime.now() - timedelta(days=days)):
+        for instance, step_id, step_name, start_seconds, step_duration, step_status in step_rows(n, started, duration, status):
+            rows.append((
+                instance, step_id, step_name, started.strftime('%d/%m/%Y'), hhmmss(start_seconds),
+                hhmmss(step_duration), step_status, message(n, step_id, step_status)
+            ))
+    return rows
+
+
+CATALOG_COLUMNS = [
+    'job_id', 'job_name', 'job_enabled', 'schedule_id', 'schedule_name', 'enabled', 'freq_type', 'freq_interval',
+    'freq_subday_type', 'freq_subday_interval', 'freq_relative_interval', 'freq_recurrence_factor',
+    'active_start_date', 'active_end_date', 'active_start_time', 'active_end_time'
+]
+HISTORY_COLUMNS = [
+    'job_id', 'job_name', 'job_enabled', 'schedule_id', 'schedule_name', 'freq_type', 'freq_interval',
+    'run_date_formatted', 'run_time_formatted', 'run_duration', 'run_duration_formatted',
+    'run_status_description', 'message', 'instance_id', 'step_id'
+]
+JOB_COLUMNS = [
+    'job_id', 'job_name', 'job_enabled', 'description', 'schedule_name',
+    'next_run_date_formatted', 'next_run_time_formatted'
+]
+JOB_HISTORY_COLUMNS = [
+    'instance_id', 'step_id', 'step_name', 'run_date_formatted', 'run_time_formatted',
+    'run_duration_formatted', 'run_status_description', 'message'
+]
+
+
+class FakeCursor:
+    """Answers the dashboard's queries from generated data, recognised by their text."""
+
+    def __init__(self):
+        self.description = None
+        self.rows = []
+
+    def execute(self, query, *params):
+        global query_count
+        with query_count_lock:
+            query_count += 1
+        time.sleep(settings['latency_ms'] / 1000)
+        if 'active_start_date' in query:
+            columns, self.rows = CATALOG_COLUMNS, catalog_rows()
+        elif 'h.job_id = ?' in query:
+            columns, self.rows = JOB_HISTORY_COLUMNS, job_history_rows(params[0], -params[1])
+        elif 'j.job_id = ?' in query:
+            columns, self.rows = JOB_COLUMNS, job_rows(params[0])
+        elif 'run_status_description' in query:
+            columns, self.rows = HISTORY_COLUMNS, history_rows()
+        else:
+            raise FakeError(f'Unrecognised query: {query[:80]}')
+        self.description = [(column,) for column in columns]
+        return self
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    timeout = 0
+
+    def cursor(self):
+        return FakeCursor()
+
+    def close(self):
+        pass
+
+
+def connect():
+    """Stand-in for pyodbc.connect() backed by generated job history."""
+    return FakeConnection()
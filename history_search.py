@@ -0,0 +1,131 @@
+import math
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+# Oldest messages are dropped from the index beyond this many history rows
+MAX_DOCUMENTS = 200000
+
+TOKEN_RE = re.compile(r'[a-z0-9_]+')
+
+
+def tokenize(text):
+    """Split a message into lower-case word tokens."""
+    if not text:
+        return []
+    return TOKEN_RE.findall(text.lower())
+
+
+def parse_run_date(value):
+    """Parse the dd/mm/yyyy run date returned by the history query."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%d/%m/%Y').date()
+    except ValueError:
+        return None
+
+
+class HistorySearchIndex:
+    """Inverted index over the messages of locally retained job history.
+
+    Documents are added one history row at a time, so the index grows
+    incrementally with every refresh. Queries AND their terms together and
+    rank matches by TF-IDF.
+    """
+
+    def __init__(self, max_documents=MAX_DOCUMENTS):
+        self.max_documents = max_documents
+        self.documents = OrderedDict()
+        self.postings = {}
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.documents)
+
+    def add(self, doc_key, job_id, job_name, run_date, run_time, status, message, step_id=0):
+        """Index one history row (a job outcome or a step); rows already indexed are ignored."""
+        with self.lock:
+            if doc_key in self.documents:
+                return False
+            counts = {}
+            for token in tokenize(message):
+                counts[token] = counts.get(token, 0) + 1
+            self.documents[doc_key] = {
+                'job_id': job_id,
+                'job_name': job_name,
+                'run_date': run_date,
+                'run_time': run_time,
+                'step_id': step_id,
+                'date': parse_run_date(run_date),
+                'status': status,
+                'message': message,
+                'tokens': counts,
+            }
+            for token, tf in counts.items():
+                self.postings.setdefault(token, {})[doc_key] = tf
+            if len(self.documents) > self.max_documents:
+                self._evict_oldest()
+            return True
+
+    def _evict_oldest(self):
+        doc_key, doc = self.documents.popitem(last=False)
+        for token in doc['tokens']:
+            docs = self.postings.get(token)
+            if docs is None:
+                continue
+            docs.pop(doc_key, None)
+            if not docs:
+                del self.postings[token]
+
+    def search(self, query, job=None, status=None, date_from=None, date_to=None, limit=50):
+        """Return the best matching runs for a query, newest first among equal scores."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        job = job.lower() if job else None
+        status = status.lower() if status else None
+
+        with self.lock:
+            postings = [self.postings.get(term) for term in terms]
+            if not all(postings):
+                return []
+            # Intersect starting from the rarest term to keep the candidate set small
+            postings.sort(key=len)
+            candidates = set(postings[0])
+            for docs in postings[1:]:
+                candidates.intersection_update(docs)
+                if not candidates:
+                    return []
+
+            total = len(self.documents)
+            idf = [math.log(1 + total / len(docs)) for docs in postings]
+            results = []
+            for doc_key in candidates:
+                doc = self.documents[doc_key]
+                if job and job not in doc['job_name'].lower() and job != str(doc['job_id']).lower():
+                    continue
+                if status and doc['status'].lower() != status:
+                    continue
+                if date_from and (doc['date'] is None or doc['date'] < date_from):
+                    continue
+                if date_to and (doc['date'] is None or doc['date'] > date_to):
+                    continue
+                score = sum(docs[doc_key] * weight for docs, weight in zip(postings, idf))
+                results.append((score, doc['date'], doc['run_time'], doc))
+
+        results.sort(key=lambda r: (r[0], r[1] or datetime.min.date(), r[2] or ''), reverse=True)
+        return [
+            {
+                'job_id': str(doc['job_id']),
+                'job_name': doc['job_name'],
+                'run_date': doc['run_date'],
+                'run_time': doc['run_time'],
+                'step_id': doc['step_id'],
+                'status': doc['status'],
+                'message': doc['message'],
+                'score': round(score, 3),
+            }
+            for score, _, _, doc in results[:limit]
+        ]
@@ -0,0 +1,91 @@
+import bisect
+import heapq
+from array import array
+
+from run_store import STATUS_CODES
+
+# Above this many position lists, a filter scans the job column instead of merging them
+MAX_MERGED_LISTS = 16
+
+
+def merge_positions(lists):
+    """Union of sorted run position lists, in ascending order."""
+    if len(lists) == 1:
+        return list(lists[0])
+    return list(heapq.merge(*lists))
+
+
+class RunIndex:
+    """Filter index over one snapshot's runs, built once per snapshot.
+
+    Job names are kept in a sorted array for prefix lookups; runs are
+    indexed by sorted per-job and per-status position arrays, so a filter
+    only touches the positions of the runs it could return, at 4 bytes per
+    run for each of the two indexes.
+    """
+
+    def __init__(self, store, job_attrs):
+        self.store = store
+        self.size = len(store)
+        self.job_attrs = job_attrs
+        names = sorted((name.lower(), code) for code, name in enumerate(store.job_names))
+        self.names = [name for name, _ in names]
+        self.name_codes = [code for _, code in names]
+
+        self.job_positions, self.status_positions = {}, {}
+        for i, (job, status) in enumerate(zip(store.jobs, store.statuses)):
+            positions = self.job_positions.get(job)
+            if positions is None:
+                positions = self.job_positions[job] = array('i')
+            positions.append(i)
+            positions = self.status_positions.get(status)
+            if positions is None:
+                positions = self.status_positions[status] = array('i')
+            positions.append(i)
+
+    def jobs_with_prefix(self, prefix):
+        prefix = prefix.lower()
+        lo = bisect.bisect_left(self.names, prefix)
+        hi = bisect.bisect_left(self.names, prefix + '\uffff')
+        return set(self.name_codes[lo:hi])
+
+    def jobs_containing(self, text):
+        text = text.lower()
+        return {code for name, code in zip(self.names, self.name_codes) if text in name}
+
+    def select(self, prefix=None, contains=None, statuses=None, enabled=None, schedule=None):
+        """Positions of the runs matching every given filter."""
+        jobs = None
+        if prefix:
+            jobs = self.jobs_with_prefix(prefix)
+        if contains:
+            matching = self.jobs_containing(contains)
+            jobs = matching if jobs is None else jobs & matching
+        if enabled is not None or schedule:
+            schedule = schedule.lower() if schedule else None
+            matching = set()
+            for code, job_id in enumerate(self.store.job_ids):
+                attrs = self.job_attrs.get(job_id, {})
+                if enabled is not None and attrs.get('enabled') != enabled:
+                    continue
+                if schedule and schedule not in attrs.get('schedules', ()):
+                    continue
+                matching.add(code)
+            jobs = matching if jobs is None else jobs & matching
+
+        if statuses:
+            codes = {STATUS_CODES.get(status) for status in statuses}
+            lists = [self.status_positions[code] for code in codes if code in self.status_positions]
+            if not lists:
+                return []
+            positions = merge_positions(lists)
+            if jobs is None:
+                return positions
+            run_jobs = self.store.jobs
+            return [i for i in positions if run_jobs[i] in jobs]
+        if jobs is None:
+            return list(range(self.size))
+        lists = [self.job_positions[code] for code in jobs if code in self.job_positions]
+        if len(lists) > MAX_MERGED_LISTS:
+            return [i for i, job in enumerate(self.store.jobs) if job in jobs]
+        return merge_positions(lists) if lists else []
@@ -0,0 +1,200 @@
+import threading
+from collections import OrderedDict, deque
+
+# A run is only flagged once its job has this many earlier runs
+MIN_SAMPLES = 5
+# Standard deviations away from the mean before a run counts as abnormal
+Z_THRESHOLD = 2.0
+# Ignore deviations smaller than this, so 3s vs 5s jobs are not flagged
+MIN_DEVIATION_SECONDS = 60
+# How many run keys (and their flags) are remembered for de-duplication
+MAX_TRACKED_RUNS = 100000
+# How many flagged runs are listed by to_dict()
+MAX_FLAGGED_RUNS = 1000
+
+
+class P2Quantile:
+    """Streaming quantile estimate using the P-square algorithm (Jain & Chlamtac).
+
+    Keeps five markers, so each new value is O(1) work and O(1) memory.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        q = self.heights
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                h = self._parabolic(i, d)
+                if not q[i - 1] < h < q[i + 1]:
+                    h = self._linear(i, d)
+                q[i] = h
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i, d):
+        q, n = self.heights, self.positions
+        return q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+
+    def value(self):
+        q = self.heights
+        if not q:
+            return None
+        if len(q) < 5:
+            # Too few values for the markers yet, use the exact quantile
+            return q[min(len(q) - 1, int(round(self.p * (len(q) - 1))))]
+        return q[2]
+
+
+class JobDurationStats:
+    """Running mean/variance (Welford) and p50/p95 of one job's run durations."""
+
+    def __init__(self, job_name):
+        self.job_name = job_name
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.p50 = P2Quantile(0.5)
+        self.p95 = P2Quantile(0.95)
+        self.long_runs = 0
+        self.short_runs = 0
+
+    def add(self, seconds):
+        self.count += 1
+        delta = seconds - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (seconds - self.mean)
+        self.p50.add(seconds)
+        self.p95.add(seconds)
+
+    @property
+    def stddev(self):
+        if self.count < 2:
+            return 0.0
+        return (self.m2 / (self.count - 1)) ** 0.5
+
+    def classify(self, seconds):
+        """Return 'long', 'short' or None for a duration against the stats so far."""
+        if self.count < MIN_SAMPLES:
+            return None
+        deviation = seconds - self.mean
+        if abs(deviation) < MIN_DEVIATION_SECONDS:
+            return None
+        limit = Z_THRESHOLD * self.stddev
+        if deviation > limit and seconds > self.p95.value():
+            return 'long'
+        if -deviation > limit:
+            return 'short'
+        return None
+
+    def to_dict(self):
+        return {
+            'job_name': self.job_name,
+            'runs': self.count,
+            'mean_seconds': round(self.mean, 1),
+            'stddev_seconds': round(self.stddev, 1),
+            'p50_seconds': self.p50.value(),
+            'p95_seconds': self.p95.value(),
+            'long_runs': self.long_runs,
+            'short_runs': self.short_runs,
+        }
+
+
+class JobStatsEngine:
+    """Per-job duration statistics, updated as runs are ingested.
+
+    Every run is classified against its job's stats before being folded into
+    them, so each new run costs O(1) and history is never rescanned. Runs
+    already seen (same key) are skipped, which lets the same query window be
+    ingested on every refresh. A lock guards the state, since refreshes
+    ingest while request threads read it.
+    """
+
+    def __init__(self, max_tracked_runs=MAX_TRACKED_RUNS):
+        self.jobs = {}
+        self.flags = OrderedDict()
+        self.flagged = deque(maxlen=MAX_FLAGGED_RUNS)
+        self.max_tracked_runs = max_tracked_runs
+        self.lock = threading.Lock()
+
+    def ingest(self, run_key, job_id, job_name, seconds, run_info=None):
+        with self.lock:
+            return self._ingest(run_key, job_id, job_name, seconds, run_info)
+
+    def _ingest(self, run_key, job_id, job_name, seconds, run_info):
+        if run_key in self.flags:
+            return self.flags[run_key]
+
+        stats = self.jobs.get(job_id)
+        if stats is None:
+            stats = self.jobs[job_id] = JobDurationStats(job_name)
+
+        flag = stats.classify(seconds)
+        if flag == 'long':
+            stats.long_runs += 1
+        elif flag == 'short':
+            stats.short_runs += 1
+        stats.add(seconds)
+
+        self.flags[run_key] = flag
+        if flag:
+            self.flagged.append(dict(run_info or {}, run_key=run_key, job_id=job_id, flag=flag))
+        if len(self.flags) > self.max_tracked_runs:
+            self.flags.popitem(last=False)
+        return flag
+
+    def seen(self, run_key):
+        with self.lock:
+            return run_key in self.flags
+
+    def flag_for(self, run_key):
+        with self.lock:
+            return self.flags.get(run_key)
+
+    def job_to_dict(self, job_id):
+        """Stats of one job, or None if none of its runs were ingested."""
+        with self.lock:
+            stats = self.jobs.get(job_id)
+            return stats.to_dict() if stats else None
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'jobs': {job_id: stats.to_dict() for job_id, stats in self.jobs.items()},
+                'flagged_runs': list(self.flagged),
+            }
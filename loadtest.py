@@ -0,0 +1,209 @@
+"""Simulate a fleet of auto-refreshing wallboards against the Hi.py dashboard.
+
+Each client loads the page, fetches its same-origin assets and reloads every
+--refresh seconds, like the page's own 30 second reload. Without --url,
+Hi.py is started in a subprocess on the fake msdb (fake_msdb.py), so the
+clients here do not compete with the server for the GIL. Backend queries
+are read from the app's /ready endpoint, which reports them on the fake
+msdb; they are left out against a real database.
+
+Numbers from one machine running both sides are still only comparable with
+each other. Point --url at a dashboard on its own host for absolute ones.
+
+    python loadtest.py --clients 50 --duration 120 --refresh 30
+    python loadtest.py --clients 200 --save after.json --baseline before.json
+"""
+import argparse
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+ASSET_RE = re.compile(r'''<(?:script|link|img)[^>]+(?:src|href)=["']([^"']+)["']''')
+
+
+class Results:
+    def __init__(self):
+        self.latencies = []
+        self.bytes = 0
+        self.errors = 0
+        self.page_loads = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds, size, ok):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.bytes += size
+            if not ok:
+                self.errors += 1
+
+
+def fetch(url, results, timeout):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            body = response.read()
+        results.record(time.perf_counter() - started, len(body), True)
+        return body
+    except Exception:
+        results.record(time.perf_counter() - started, 0, False)
+        return None
+
+
+def same_origin_assets(base_url, page):
+    base = urllib.parse.urlsplit(base_url)
+    assets = []
+    for link in ASSET_RE.findall(page.decode('utf-8', 'replace')):
+        url = urllib.parse.urljoin(base_url, link)
+        if urllib.parse.urlsplit(url).netloc == base.netloc:
+            assets.append(url)
+    return assets
+
+
+def wallboard(url, results, stop_at, refresh, timeout):
+    """One client: load the page and its assets, then reload every refresh seconds."""
+    # Wallboards are not switched on in lock-step
+    time.sleep(random.uniform(0, refresh))
+    while time.monotonic() < stop_at:
+        page = fetch(url, results, timeout)
+        with results.lock:
+            results.page_loads += 1
+        if page:
+            for asset in same_origin_assets(url, page):
+                fetch(asset, results, timeout)
+        time.sleep(max(0.0, min(refresh, stop_at - time.monotonic())))
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def backend_queries(url):
+    """Queries the app has run so far, from its /ready endpoint; None if it does not report them."""
+    try:
+        with urllib.request.urlopen(urllib.parse.urljoin(url, '/ready'), timeout=10) as response:
+            return json.load(response).get('backend_queries')
+    except Exception:
+        return None
+
+
+def start_local_app(fake_jobs, fake_latency_ms, startup_timeout=120):
+    """Start Hi.py on the fake msdb in a subprocess; return its URL once /ready answers, and the process."""
+    port = free_port()
+    env = dict(
+        os.environ, FAKE_DB='1', FAKE_DB_JOBS=str(fake_jobs), FAKE_DB_LATENCY_MS=str(fake_latency_ms),
+        PORT=str(port), WARM_UP='1'
+    )
+    # The app's access log, one line per simulated request, goes to a file rather than the report
+    log = tempfile.TemporaryFile()
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+    process = subprocess.Popen([sys.executable, 'Hi.py'], cwd=app_dir, env=env, stdout=log, stderr=subprocess.STDOUT)
+    url = f'http://127.0.0.1:{port}/'
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            with urllib.request.urlopen(urllib.parse.urljoin(url, '/ready'), timeout=5):
+                return url, process
+        except Exception:
+            time.sleep(0.5)
+    process.kill()
+    log.seek(0)
+    raise RuntimeError('Hi.py did not become ready:\n' + log.read().decode('utf-8', 'replace')[-2000:])
+
+
+def run(args):
+    process = None
+    url = args.url
+    if url is None:
+        url, process = start_local_app(args.fake_jobs, args.fake_latency_ms)
+    try:
+        return measure(args, url)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+def measure(args, url):
+    queries_before = backend_queries(url)
+
+    results = Results()
+    started = time.monotonic()
+    stop_at = started + args.duration
+    clients = [
+        threading.Thread(target=wallboard, args=(url, results, stop_at, args.refresh, args.timeout), daemon=True)
+        for _ in range(args.clients)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.monotonic() - started
+    queries_after = backend_queries(url)
+
+    latencies = results.latencies
+    return {
+        'clients': args.clients,
+        'duration_seconds': round(elapsed, 1),
+        'requests': len(latencies),
+        'page_loads': results.page_loads,
+        'errors': results.errors,
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+        'bytes_served': results.bytes,
+        'backend_queries': queries_after - queries_before if None not in (queries_before, queries_after) else None
+    }
+
+
+def print_report(report, baseline=None):
+    for key, value in report.items():
+        line = f'{key:>18}: {value}'
+        if baseline and isinstance(value, (int, float)) and isinstance(baseline.get(key), (int, float)) and baseline[key]:
+            line += f'  ({(value - baseline[key]) / baseline[key] * 100:+.1f}% vs baseline {baseline[key]})'
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='dashboard to test; default is Hi.py in a subprocess on the fake msdb')
+    parser.add_argument('--clients', type=int, default=20, help='number of simulated wallboards')
+    parser.add_argument('--duration', type=float, default=60, help='test length in seconds')
+    parser.add_argument('--refresh', type=float, default=30, help='seconds between page reloads per client')
+    parser.add_argument('--timeout', type=float, default=30, help='per-request timeout in seconds')
+    parser.add_argument('--fake-jobs', type=int, default=50, help='jobs in the fake msdb')
+    parser.add_argument('--fake-latency-ms', type=int, default=50, help='latency of each fake query')
+    parser.add_argument('--save', help='write the report as JSON to this file')
+    parser.add_argument('--baseline', help='compare with a report saved earlier with --save')
+    args = parser.parse_args()
+
+    report = run(args)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import re
+import threading
+import time
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the database while the circuit is open."""
+
+
+class CircuitBreaker:
+    """Stop calling a failing server for a while after repeated errors.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    fail fast with CircuitOpenError. Once reset_seconds have passed a single
+    trial call is let through; success closes the circuit, failure opens it
+    again.
+    """
+
+    def __init__(self, failure_threshold=3, reset_seconds=30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return 'half-open'
+        return 'open'
+
+    def call(self, fn, *args, **kwargs):
+        with self.lock:
+            state = self.state
+            if state == 'open' or (state == 'half-open' and self.trial_running):
+                raise CircuitOpenError(f"Database circuit open after {self.failures} failures")
+            if state == 'half-open':
+                self.trial_running = True
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with self.lock:
+                self.trial_running = False
+                self.failures += 1
+                if self.failures >= self.failure_threshold:
+                    self.opened_at = time.monotonic()
+            raise
+        with self.lock:
+            self.trial_running = False
+            self.failures = 0
+            self.opened_at = None
+        return result
+
+
+def with_stale_banner(html, age_seconds):
+    """Insert a "data is N minutes old" banner at the top of a rendered page."""
+    minutes = int(age_seconds // 60)
+    banner = (
+        '<div style="position: fixed; top: 0; left: 0; right: 0; z-index: 10000; background-color: #ffc107; '
+        'color: #000; text-align: center; padding: 6px; font-family: Arial, sans-serif;">'
+        f'Database unavailable - data is {minutes} minute{"" if minutes == 1 else "s"} old</div>'
+    )
+    return re.sub(r'<body[^>]*>', lambda m: m.group(0) + banner, html, count=1)
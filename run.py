@@ -1,18 +1,47 @@
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.io as pio
-import pyodbc
+import time
+
+# Start-up timings are measured from here, so they include the imports below
+PROCESS_STARTED = time.perf_counter()
+
 from datetime import datetime, timedelta
-from flask import Flask, render_template_string, abort
+from flask import Flask, render_template_string, abort, jsonify
 import os
 
+from lazy_import import lazy_module
+from resilience import CircuitBreaker, with_stale_banner
+
+# Heavy modules are imported on first use instead of at start-up
+pd = lazy_module('pandas')
+go = lazy_module('plotly.graph_objects')
+pio = lazy_module('plotly.io')
+pyodbc = lazy_module('pyodbc')
+
 app = Flask(__name__)
 
 # Configuration settings
 app.config['PORT'] = int(os.getenv('PORT', 3001))
+app.config['DB_LOGIN_TIMEOUT'] = int(os.getenv('DB_LOGIN_TIMEOUT', 5))
+app.config['DB_QUERY_TIMEOUT'] = int(os.getenv('DB_QUERY_TIMEOUT', 20))
+app.config['DB_FAILURE_THRESHOLD'] = int(os.getenv('DB_FAILURE_THRESHOLD', 3))
+app.config['DB_RETRY_SECONDS'] = int(os.getenv('DB_RETRY_SECONDS', 30))
+app.config['WARM_UP'] = os.getenv('WARM_UP', '1') == '1'
+
+# Cold start timings, reported by /ready
+startup = {
+    'ready': False,
+    'imports_seconds': round(time.perf_counter() - PROCESS_STARTED, 3),
+    'warm_up_seconds': None,
+    'first_byte_seconds': None
+}
+
+# Stops hitting msdb for DB_RETRY_SECONDS after DB_FAILURE_THRESHOLD failures in a row
+db_breaker = CircuitBreaker(app.config['DB_FAILURE_THRESHOLD'], app.config['DB_RETRY_SECONDS'])
+
+# Last page rendered from fresh data, served while the database is failing
+last_good_page = {'html': None, 'rendered_at': 0}
 
 def get_db_connection():
-    """Establish a database connection."""
+    """Establish a database connection with login and query timeouts."""
     conn_str = (
         'DRIVER={ODBC Driver 17 for SQL Server};'
         'SERVER=192.168.0.41;'
@@ -20,10 +49,12 @@ def get_db_connection():
         'Trusted_Connection=yes;'
     )
     try:
-        return pyodbc.connect(conn_str)
+        conn = pyodbc.connect(conn_str, timeout=app.config['DB_LOGIN_TIMEOUT'])
     except pyodbc.Error as e:
         app.logger.error(f"Database connection error: {e}")
-        abort(500, description="Database connection error")
+        raise
+    conn.timeout = app.config['DB_QUERY_TIMEOUT']
+    return conn
 
 def fetch_job_data():
     """Fetch job data from the database."""
@@ -75,11 +106,13 @@ def fetch_job_data():
         s.schedule_id DESC, h.run_date DESC, h.run_time DESC;
     '''
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(query)
-    columns = [column[0] for column in cursor.description]
-    rows = cursor.fetchall()
-    conn.close()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        columns = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
     return columns, rows
 
 def time_to_minutes(time_str):
@@ -129,7 +162,7 @@ def determine_step_interval(current_time, last_6_hours_start):
 @app.route('/')
 def index():
     try:
-        columns, rows = fetch_job_data()
+        columns, rows = db_breaker.call(fetch_job_data)
         
         job_data = {
             'Job': [row[1] for row in rows],
@@ -302,11 +335,43 @@ def index():
         </html>
         '''
 
-        return render_template_string(html_template, graph_html=graph_html)
+        page = render_template_string(html_template, graph_html=graph_html)
+        last_good_page.update(html=page, rendered_at=time.time())
+        startup['ready'] = True
+        return page
     except Exception as e:
         app.logger.error(f"Error rendering page: {e}")
+        if last_good_page['html'] is not None:
+            return with_stale_banner(last_good_page['html'], time.time() - last_good_page['rendered_at'])
         abort(500, description="Internal Server Error")
 
+def warm_up():
+    """Render the first page, importing pandas, plotly and pyodbc, before reporting ready."""
+    started = time.perf_counter()
+    with app.test_request_context('/'):
+        index()
+    startup['warm_up_seconds'] = round(time.perf_counter() - started, 3)
+    app.logger.info(f"Warm-up finished in {startup['warm_up_seconds']}s")
+
+@app.after_request
+def record_first_byte(response):
+    if startup['first_byte_seconds'] is None:
+        startup['first_byte_seconds'] = round(time.perf_counter() - PROCESS_STARTED, 3)
+        app.logger.info(f"First response {startup['first_byte_seconds']}s after process start")
+    return response
+
+@app.route('/ready')
+def ready():
+    """Readiness probe with the cold start timings; ready once a page was rendered from fresh data."""
+    return jsonify(dict(startup, database=db_breaker.state)), 200 if startup['ready'] else 503
+
 if __name__ == '__main__':
+    if app.config['WARM_UP']:
+        try:
+            warm_up()
+        except Exception as e:
+            app.logger.error(f"Warm-up failed, serving cold: {e}")
+    else:
+        startup['ready'] = True
     # app.run(port=app.config['PORT'])
     app.run(host='0.0.0.0', port=app.config['PORT'])
@@ -0,0 +1,109 @@
+import sys
+from array import array
+
+# Status codes are indexes into this tuple
+STATUSES = ('Success', 'Failure', 'Retry', 'Canceled', 'Unknown')
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Anomaly flag codes (see job_stats), likewise indexes into this tuple
+FLAGS = (None, 'long', 'short')
+FLAG_CODES = {flag: code for code, flag in enumerate(FLAGS)}
+
+# Bytes stored per run: job (int32) + status and flag (int8 each) + run date, start and duration (int32 each)
+BYTES_PER_RUN = 4 + 1 + 1 + 4 + 4 + 4
+
+
+class Run:
+    """One job run, materialised from a RunStore only when asked for."""
+
+    __slots__ = ('job_id', 'job_name', 'run_date', 'start_seconds', 'duration_seconds', 'status', 'flag')
+
+    def __init__(self, job_id, job_name, run_date, start_seconds, duration_seconds, status, flag=None):
+        self.job_id = job_id
+        self.job_name = job_name
+        self.run_date = run_date
+        self.start_seconds = start_seconds
+        self.duration_seconds = duration_seconds
+        self.status = status
+        self.flag = flag
+
+    def __repr__(self):
+        return f"<Run {self.job_name} {self.run_date} +{self.start_seconds}s {self.duration_seconds}s {self.status}>"
+
+
+class RunStore:
+    """Column store of job runs backed by typed arrays.
+
+    Job ids and names are interned once per job and runs refer to them by an
+    int32 code; statuses and anomaly flags are int8 codes; run date
+    (yyyymmdd), start (seconds since midnight) and duration (seconds) are
+    int32. A run therefore costs BYTES_PER_RUN (18) bytes, at most 20 with
+    the arrays' growth headroom, plus a fixed cost per distinct job.
+
+    Each snapshot's runs live in one of these, which the chart, kiosk view
+    and filter index read. The bound covers only this store: the statistics
+    engine and search index keep their own per-run entries as Python objects.
+    """
+
+    def __init__(self):
+        self.job_ids = []
+        self.job_names = []
+        self.job_codes = {}
+        self.jobs = array('i')
+        self.statuses = array('b')
+        self.flags = array('b')
+        self.run_dates = array('i')
+        self.starts = array('i')
+        self.durations = array('i')
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def intern_job(self, job_id, job_name):
+        """Return the code of a job, registering it on first sight."""
+        code = self.job_codes.get(job_id)
+        if code is None:
+            code = self.job_codes[job_id] = len(self.job_ids)
+            self.job_ids.append(job_id)
+            self.job_names.append(sys.intern(job_name))
+        return code
+
+    def append(self, job_id, job_name, run_date, start_seconds, duration_seconds, status, flag=None):
+        self.jobs.append(self.intern_job(job_id, job_name))
+        self.statuses.append(STATUS_CODES.get(status, STATUS_CODES['Unknown']))
+        self.flags.append(FLAG_CODES[flag])
+        self.run_dates.append(run_date)
+        self.starts.append(start_seconds)
+        self.durations.append(duration_seconds)
+
+    def __getitem__(self, i):
+        job = self.jobs[i]
+        return Run(
+            self.job_ids[job],
+            self.job_names[job],
+            self.run_dates[i],
+            self.starts[i],
+            self.durations[i],
+            STATUSES[self.statuses[i]],
+            FLAGS[self.flags[i]]
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def subset(self, positions):
+        """A new store with only the runs at the given positions; job codes are shared."""
+        store = RunStore()
+        store.job_ids, store.job_names, store.job_codes = self.job_ids, self.job_names, self.job_codes
+        for name in ('jobs', 'statuses', 'flags', 'run_dates', 'starts', 'durations'):
+            column = getattr(self, name)
+            setattr(store, name, array(column.typecode, (column[i] for i in positions)))
+        return store
+
+    def nbytes(self):
+        """Bytes held by the run columns, including growth headroom."""
+        return sum(
+            sys.getsizeof(column)
+            for column in (self.jobs, self.statuses, self.flags, self.run_dates, self.starts, self.durations)
+        )
@@ -0,0 +1,192 @@
+import bisect
+import calendar
+from datetime import date, datetime, time, timedelta
+
+# sysschedules.freq_type
+FREQ_ONCE = 1
+FREQ_DAILY = 4
+FREQ_WEEKLY = 8
+FREQ_MONTHLY = 16
+FREQ_MONTHLY_RELATIVE = 32
+FREQ_AGENT_START = 64
+FREQ_IDLE = 128
+
+# sysschedules.freq_subday_type
+SUBDAY_AT_TIME = 1
+SUBDAY_SECONDS = 2
+SUBDAY_MINUTES = 4
+SUBDAY_HOURS = 8
+
+SUBDAY_UNIT_SECONDS = {SUBDAY_SECONDS: 1, SUBDAY_MINUTES: 60, SUBDAY_HOURS: 3600}
+
+# freq_interval values of monthly relative schedules beyond the weekdays 1 (Sunday) .. 7 (Saturday)
+RELATIVE_DAY = 8
+RELATIVE_WEEKDAY = 9
+RELATIVE_WEEKEND_DAY = 10
+
+# freq_relative_interval: First, Second, Third, Fourth, Last
+RELATIVE_ORDINALS = {1: 0, 2: 1, 4: 2, 8: 3, 16: -1}
+
+# Runs starting more than this long after a planned instant are treated as unplanned
+MAX_LATENESS = timedelta(hours=1)
+
+
+def int_to_date(value):
+    """Convert an msdb yyyymmdd integer to a date."""
+    value = int(value)
+    if value <= 0:
+        return None
+    return date(value // 10000, value // 100 % 100, value % 100)
+
+
+def int_to_time(value):
+    """Convert an msdb hhmmss integer to a time."""
+    value = int(value)
+    return time(value // 10000, value // 100 % 100, value % 100)
+
+
+def sql_weekday(day):
+    """Weekday numbered the SQL Agent way: 1 = Sunday .. 7 = Saturday."""
+    return (day.weekday() + 1) % 7 + 1
+
+
+def week_start(day):
+    """The Sunday that starts the SQL Agent week containing day."""
+    return day - timedelta(days=sql_weekday(day) - 1)
+
+
+def relative_days(year, month, freq_interval):
+    """All days of a month matching a monthly relative schedule's day kind."""
+    days = [date(year, month, d) for d in range(1, calendar.monthrange(year, month)[1] + 1)]
+    if freq_interval == RELATIVE_DAY:
+        return days
+    if freq_interval == RELATIVE_WEEKDAY:
+        return [d for d in days if 2 <= sql_weekday(d) <= 6]
+    if freq_interval == RELATIVE_WEEKEND_DAY:
+        return [d for d in days if sql_weekday(d) in (1, 7)]
+    return [d for d in days if sql_weekday(d) == freq_interval]
+
+
+def runs_on(schedule, day):
+    """Whether the schedule has runs on the given date."""
+    start_date = int_to_date(schedule['active_start_date'])
+    end_date = int_to_date(schedule['active_end_date'])
+    if start_date and day < start_date:
+        return False
+    if end_date and day > end_date:
+        return False
+
+    freq_type = schedule['freq_type']
+    interval = schedule['freq_interval']
+    factor = max(schedule.get('freq_recurrence_factor') or 1, 1)
+
+    if freq_type == FREQ_ONCE:
+        return day == start_date
+    if freq_type == FREQ_DAILY:
+        return (day - start_date).days % max(interval, 1) == 0
+    if freq_type == FREQ_WEEKLY:
+        if not interval & (1 << (sql_weekday(day) - 1)):
+            return False
+        return (week_start(day) - week_start(start_date)).days // 7 % factor == 0
+    if freq_type in (FREQ_MONTHLY, FREQ_MONTHLY_RELATIVE):
+        months = (day.year - start_date.year) * 12 + day.month - start_date.month
+        if months % factor:
+            return False
+        if freq_type == FREQ_MONTHLY:
+            return day.day == interval
+        ordinal = RELATIVE_ORDINALS.get(schedule.get('freq_relative_interval'))
+        candidates = relative_days(day.year, day.month, interval)
+        if ordinal is None or ordinal >= len(candidates):
+            return False
+        return candidates[ordinal] == day
+    # Agent start, idle and unknown schedules have no predictable instants
+    return False
+
+
+def times_of_day(schedule):
+    """Start times within one day, from active_start_time to active_end_time."""
+    first = int_to_time(schedule['active_start_time'])
+    if schedule['freq_type'] == FREQ_ONCE or schedule['freq_subday_type'] == SUBDAY_AT_TIME:
+        return [first]
+    unit = SUBDAY_UNIT_SECONDS.get(schedule['freq_subday_type'])
+    step = unit * (schedule.get('freq_subday_interval') or 0) if unit else 0
+    if step <= 0:
+        return [first]
+    last = int_to_time(schedule['active_end_time'])
+    start_seconds = first.hour * 3600 + first.minute * 60 + first.second
+    end_seconds = last.hour * 3600 + last.minute * 60 + last.second
+    return [
+        time(s // 3600, s // 60 % 60, s % 60)
+        for s in range(start_seconds, min(end_seconds, 86399) + 1, step)
+    ]
+
+
+def expand_schedule(schedule, start, end):
+    """Yield the planned run instants of one sysschedules row in [start, end)."""
+    if schedule['freq_type'] in (FREQ_AGENT_START, FREQ_IDLE) or not schedule.get('enabled', 1):
+        return
+    times = times_of_day(schedule)
+    day = start.date()
+    while day <= end.date():
+        if runs_on(schedule, day):
+            for t in times:
+                instant = datetime.combine(day, t)
+                if start <= instant < end:
+                    yield instant
+        day += timedelta(days=1)
+
+
+class ScheduleTimeline:
+    """Sorted index of planned run instants for a set of job schedules.
+
+    Built once from the schedule catalog for a time window, then answers
+    upcoming-run and lateness lookups with bisection only.
+    """
+
+    def __init__(self, catalog, start, end):
+        self.start = start
+        self.end = end
+        entries = []
+        by_job = {}
+        for job in catalog:
+            if not job.get('job_enabled', 1):
+                continue
+            for instant in expand_schedule(job, start, end):
+                entries.append((instant, job['job_name'], str(job['job_id']), job['schedule_name']))
+                by_job.setdefault(str(job['job_id']), []).append(instant)
+        entries.sort()
+        self.entries = entries
+        self.instants = [entry[0] for entry in entries]
+        self.by_job = {job_id: sorted(instants) for job_id, instants in by_job.items()}
+
+    def covers(self, start, end):
+        return self.start <= start and end <= self.end
+
+    def upcoming(self, start, end):
+        """Planned runs in [start, end), in time order."""
+        lo = bisect.bisect_left(self.instants, start)
+        hi = bisect.bisect_left(self.instants, end)
+        return [
+            {'at': instant.isoformat(), 'job_name': job_name, 'job_id': job_id, 'schedule_name': schedule_name}
+            for instant, job_name, job_id, schedule_name in self.entries[lo:hi]
+        ]
+
+    def planned_for(self, job_id, actual_start):
+        """The latest planned instant of a job at or before an actual start, if recent enough."""
+        instants = self.by_job.get(str(job_id))
+        if not instants:
+            return None
+        i = bisect.bisect_right(instants, actual_start)
+        if i == 0:
+            return None
+        planned = instants[i - 1]
+        if actual_start - planned > MAX_LATENESS:
+            return None
+        return planned
+
+    def lateness(self, job_id, actual_start):
+        """Seconds between the planned instant and the actual start, or None if unplanned."""
+        planned = self.planned_for(job_id, actual_start)
+        if planned is None:
+            return None
+        return (actual_start - planned).total_seconds()
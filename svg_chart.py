@@ -0,0 +1,88 @@
+from html import escape
+
+from run_store import STATUSES
+
+# Same look as the plotly_dark chart
+BACKGROUND = '#111111'
+GRID = '#283442'
+TEXT = '#f2f5fa'
+MARGIN = dict(l=60, r=20, t=40, b=60)
+
+
+def minutes_label(minutes):
+    minutes = int(minutes) % 1440
+    return f'{minutes // 60:02}:{minutes % 60:02}'
+
+
+def render_svg(store, to_minutes, colors, view_start, view_end, width=1200, height=600, tick_step=15, min_bar=5):
+    """Status-colored bar chart of a RunStore as a standalone SVG document.
+
+    to_minutes maps a run's start (seconds since midnight) to the y-axis in
+    minutes; only [view_start, view_end] is drawn, like the interactive
+    chart's initial range.
+    """
+    plot_w = width - MARGIN['l'] - MARGIN['r']
+    plot_h = height - MARGIN['t'] - MARGIN['b']
+    span = view_end - view_start
+
+    def y_of(minutes):
+        return MARGIN['t'] + plot_h * (view_end - minutes) / span
+
+    # One category per job, in order of first appearance
+    columns = {}
+    for job in store.jobs:
+        columns.setdefault(job, len(columns))
+    band = plot_w / max(len(columns), 1)
+    bar_w = band * 0.8
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+        f'font-family="Arial, sans-serif" font-size="11">',
+        f'<rect width="{width}" height="{height}" fill="{BACKGROUND}"/>'
+    ]
+
+    first_tick = view_start + (-view_start) % tick_step
+    tick = first_tick
+    while tick <= view_end:
+        y = y_of(tick)
+        out.append(f'<line x1="{MARGIN["l"]}" x2="{width - MARGIN["r"]}" y1="{y:.1f}" y2="{y:.1f}" stroke="{GRID}"/>')
+        out.append(f'<text x="{MARGIN["l"] - 6}" y="{y + 4:.1f}" fill="{TEXT}" text-anchor="end">{minutes_label(tick)}</text>')
+        tick += tick_step
+
+    out.append(f'<svg x="{MARGIN["l"]}" y="{MARGIN["t"]}" width="{plot_w}" height="{plot_h}" overflow="hidden">')
+    for i in range(len(store)):
+        start = to_minutes(store.starts[i])
+        duration = store.durations[i] / 60
+        end = start + max(duration, min_bar)
+        if end < view_start or start > view_end:
+            continue
+        job = store.jobs[i]
+        x = columns[job] * band + (band - bar_w) / 2
+        top = y_of(end) - MARGIN['t']
+        bar_h = (end - start) * plot_h / span
+        status = STATUSES[store.statuses[i]]
+        out.append(
+            f'<rect x="{x:.1f}" y="{top:.1f}" width="{bar_w:.1f}" height="{bar_h:.1f}" fill="{colors[status]}">'
+            f'<title>{escape(store.job_names[job])} {minutes_label(start)} {duration:.1f} min {status}</title></rect>'
+        )
+        if bar_h >= 14:
+            out.append(
+                f'<text x="{x + bar_w / 2:.1f}" y="{top + bar_h / 2 + 4:.1f}" fill="{TEXT}" text-anchor="middle">{duration:.1f} min</text>'
+            )
+    out.append('</svg>')
+
+    for job, column in columns.items():
+        name = store.job_names[job]
+        label = name if len(name) <= 7 else name[:7] + '...'
+        x = MARGIN['l'] + column * band + band / 2
+        out.append(f'<text x="{x:.1f}" y="{height - MARGIN["b"] + 16}" fill="{TEXT}" text-anchor="middle">{escape(label)}</text>')
+
+    legend_x = MARGIN['l']
+    present = sorted(set(store.statuses))
+    for code in present:
+        status = STATUSES[code]
+        out.append(f'<rect x="{legend_x}" y="14" width="12" height="12" fill="{colors[status]}"/>')
+        out.append(f'<text x="{legend_x + 16}" y="24" fill="{TEXT}">{status}</text>')
+        legend_x += 90
+    out.append('</svg>')
+    return ''.join(out)
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from job_index import RunIndex
+from run_store import RunStore, STATUSES
+
+
+def build(runs=5000, jobs=40):
+    rng = random.Random(1)
+    store = RunStore()
+    for i in range(runs):
+        job = rng.randrange(jobs)
+        store.append(f'id{job}', f'Job {job:02d}', 20240101, i, 60, rng.choice(STATUSES))
+    attrs = {f'id{job}': {'enabled': job % 2 == 0, 'schedules': {'nightly'} if job % 3 else set()} for job in range(jobs)}
+    return store, RunIndex(store, attrs), attrs
+
+
+def expected(store, attrs, prefix=None, contains=None, statuses=None, enabled=None, schedule=None):
+    positions = []
+    for i, run in enumerate(store):
+        name, job_attrs = run.job_name.lower(), attrs[run.job_id]
+        if prefix and not name.startswith(prefix.lower()):
+            continue
+        if contains and contains.lower() not in name:
+            continue
+        if statuses and run.status not in statuses:
+            continue
+        if enabled is not None and job_attrs['enabled'] != enabled:
+            continue
+        if schedule and schedule.lower() not in job_attrs['schedules']:
+            continue
+        positions.append(i)
+    return positions
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'statuses': ('Success',)},
+    {'statuses': ('Failure', 'Retry')},
+    {'statuses': ('Nonsense',)},
+    {'prefix': 'job 1'},
+    {'prefix': 'Job 1', 'statuses': ('Success', 'Canceled')},
+    {'contains': '7'},
+    {'enabled': True},
+    {'enabled': False, 'schedule': 'Nightly'},
+    {'prefix': 'zzz'},
+])
+def test_select_matches_a_full_scan(filters):
+    store, index, attrs = build()
+    assert index.select(**filters) == expected(store, attrs, **filters)
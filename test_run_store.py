@@ -0,0 +1,20 @@
+from run_store import RunStore, STATUSES
+
+
+def test_runs_cost_at_most_20_bytes_each():
+    store = RunStore()
+    for i in range(1000000):
+        store.append(f'job-{i % 200}', f'Job {i % 200}', 20240101 + i % 28, i % 86400, i % 3600, STATUSES[i % 5])
+    assert len(store) == 1000000
+    assert store.nbytes() / len(store) <= 20
+
+
+def test_runs_round_trip():
+    store = RunStore()
+    store.append('a', 'Job A', 20240101, 3600, 90, 'Failure', 'long')
+    store.append('b', 'Job B', 20240102, 60, 5, 'Nonsense')
+    run = store[0]
+    assert (run.job_id, run.job_name, run.run_date, run.start_seconds, run.duration_seconds, run.status, run.flag) == \
+        ('a', 'Job A', 20240101, 3600, 90, 'Failure', 'long')
+    assert store[1].status == 'Unknown' and store[1].flag is None
+    assert [run.job_id for run in store.subset([1])] == ['b']
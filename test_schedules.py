@@ -0,0 +1,144 @@
+from datetime import datetime
+
+import pytest
+
+from schedules import expand_schedule
+
+
+def schedule(**fields):
+    """A sysschedules row, daily at midnight from 2024-01-01 unless overridden."""
+    row = {
+        'enabled': 1,
+        'freq_type': 4,
+        'freq_interval': 1,
+        'freq_subday_type': 1,
+        'freq_subday_interval': 0,
+        'freq_relative_interval': 0,
+        'freq_recurrence_factor': 0,
+        'active_start_date': 20240101,
+        'active_end_date': 99991231,
+        'active_start_time': 0,
+        'active_end_time': 235959
+    }
+    row.update(fields)
+    return row
+
+
+def at(*instants):
+    return [datetime.strptime(instant, '%Y-%m-%d %H:%M:%S') for instant in instants]
+
+
+# 2024-01-01 is a Monday
+CASES = [
+    (
+        'weekly Monday and Friday every other week',
+        schedule(freq_type=8, freq_interval=2 | 32, freq_recurrence_factor=2, active_start_time=90000),
+        '2024-01-01', '2024-01-22',
+        at('2024-01-01 09:00:00', '2024-01-05 09:00:00', '2024-01-15 09:00:00', '2024-01-19 09:00:00')
+    ),
+    (
+        'weekly Sunday belongs to the following SQL Agent week',
+        schedule(freq_type=8, freq_interval=1, freq_recurrence_factor=2),
+        '2024-01-01', '2024-01-29',
+        at('2024-01-14 00:00:00', '2024-01-28 00:00:00')
+    ),
+    (
+        'monthly on day 31 skips shorter months',
+        schedule(freq_type=16, freq_interval=31, freq_recurrence_factor=1, active_start_time=230000),
+        '2024-01-01', '2024-06-01',
+        at('2024-01-31 23:00:00', '2024-03-31 23:00:00', '2024-05-31 23:00:00')
+    ),
+    (
+        'monthly on day 31 every third month skips April',
+        schedule(freq_type=16, freq_interval=31, freq_recurrence_factor=3),
+        '2024-01-01', '2024-11-01',
+        at('2024-01-31 00:00:00', '2024-07-31 00:00:00', '2024-10-31 00:00:00')
+    ),
+    (
+        'first Monday of the month',
+        schedule(freq_type=32, freq_interval=2, freq_relative_interval=1, freq_recurrence_factor=1),
+        '2024-01-01', '2024-03-01',
+        at('2024-01-01 00:00:00', '2024-02-05 00:00:00')
+    ),
+    (
+        'last weekday of the month',
+        schedule(freq_type=32, freq_interval=9, freq_relative_interval=16, freq_recurrence_factor=1),
+        '2024-01-01', '2024-04-01',
+        at('2024-01-31 00:00:00', '2024-02-29 00:00:00', '2024-03-29 00:00:00')
+    ),
+    (
+        'first weekend day of the month',
+        schedule(freq_type=32, freq_interval=10, freq_relative_interval=1, freq_recurrence_factor=1),
+        '2024-01-01', '2024-03-01',
+        at('2024-01-06 00:00:00', '2024-02-03 00:00:00')
+    ),
+    (
+        'last weekend day of the month',
+        schedule(freq_type=32, freq_interval=10, freq_relative_interval=16, freq_recurrence_factor=1),
+        '2024-01-01', '2024-04-01',
+        at('2024-01-28 00:00:00', '2024-02-25 00:00:00', '2024-03-31 00:00:00')
+    ),
+    (
+        'every 6 hours',
+        schedule(freq_subday_type=8, freq_subday_interval=6),
+        '2024-01-01', '2024-01-02',
+        at('2024-01-01 00:00:00', '2024-01-01 06:00:00', '2024-01-01 12:00:00', '2024-01-01 18:00:00')
+    ),
+    (
+        'every 15 minutes between 08:00 and 09:00',
+        schedule(freq_subday_type=4, freq_subday_interval=15, active_start_time=80000, active_end_time=90000),
+        '2024-01-01', '2024-01-02',
+        at('2024-01-01 08:00:00', '2024-01-01 08:15:00', '2024-01-01 08:30:00', '2024-01-01 08:45:00', '2024-01-01 09:00:00')
+    ),
+    (
+        'every 20 seconds between 12:00:00 and 12:01:00',
+        schedule(freq_subday_type=2, freq_subday_interval=20, active_start_time=120000, active_end_time=120100),
+        '2024-01-01', '2024-01-02',
+        at('2024-01-01 12:00:00', '2024-01-01 12:00:20', '2024-01-01 12:00:40', '2024-01-01 12:01:00')
+    ),
+    (
+        'window start cuts a day short',
+        schedule(freq_subday_type=8, freq_subday_interval=6),
+        '2024-01-01 10:00:00', '2024-01-02 03:00:00',
+        at('2024-01-01 12:00:00', '2024-01-01 18:00:00', '2024-01-02 00:00:00')
+    ),
+    (
+        'one-time schedule',
+        schedule(freq_type=1, freq_interval=0, active_start_date=20240110, active_start_time=133000),
+        '2024-01-01', '2024-02-01',
+        at('2024-01-10 13:30:00')
+    ),
+    (
+        'one-time schedule outside the window',
+        schedule(freq_type=1, freq_interval=0, active_start_date=20240210, active_start_time=133000),
+        '2024-01-01', '2024-02-01',
+        []
+    ),
+    (
+        'disabled schedule',
+        schedule(enabled=0),
+        '2024-01-01', '2024-01-08',
+        []
+    ),
+    (
+        'runs when the agent starts',
+        schedule(freq_type=64),
+        '2024-01-01', '2024-01-08',
+        []
+    ),
+    (
+        'active end date stops a daily schedule',
+        schedule(freq_interval=2, active_end_date=20240105),
+        '2024-01-01', '2024-01-31',
+        at('2024-01-01 00:00:00', '2024-01-03 00:00:00', '2024-01-05 00:00:00')
+    )
+]
+
+
+def parse(value):
+    return datetime.fromisoformat(value)
+
+
+@pytest.mark.parametrize('row, start, end, expected', [case[1:] for case in CASES], ids=[case[0] for case in CASES])
+def test_expand_schedule(row, start, end, expected):
+    assert list(expand_schedule(row, parse(start), parse(end))) == expected
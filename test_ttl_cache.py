@@ -0,0 +1,31 @@
+from ttl_cache import TTLCache
+
+
+def test_none_results_are_cached():
+    cache = TTLCache(maxsize=4, ttl=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_load('unknown', loader) is None
+    assert cache.get_or_load('unknown', loader) is None
+    assert len(calls) == 1
+
+
+def test_expired_entries_are_reloaded():
+    cache = TTLCache(maxsize=4, ttl=-1)
+    values = iter(['first', 'second'])
+    assert cache.get_or_load('key', lambda: next(values)) == 'first'
+    assert cache.get_or_load('key', lambda: next(values)) == 'second'
+    assert cache.get('missing') is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
@@ -0,0 +1,55 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Returned by _lookup() on a miss, so that a cached None is still a hit
+MISSING = object()
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries also expire after ttl seconds.
+
+    None is a value like any other, so negative results (e.g. an unknown job)
+    are cached too.
+    """
+
+    def __init__(self, maxsize=64, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _lookup(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return MISSING
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return MISSING
+            self.entries.move_to_end(key)
+            return value
+
+    def get(self, key):
+        value = self._lookup(key)
+        return None if value is MISSING else value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def get_or_load(self, key, loader):
+        """Return the cached value for key, calling loader() on a miss; None results are cached."""
+        value = self._lookup(key)
+        if value is MISSING:
+            value = loader()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()